@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from app.models.users import User
+from app.core.security import require_admin
+from app.core.config import ARCHIVE_AFTER_DAYS
+from app.utils.archive import archive_old_loan_requests, archived_dates
+
+# Initialize the router for archive-related routes
+router = APIRouter()
+
+
+@router.post("/admin/archive")
+async def run_archive(
+    max_age_days: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Move the old loan requests to the archive now, instead of waiting for the scheduled run (admin only).
+
+    Parameters:
+    - `max_age_days` (int, optional): Age (in days, at least 1) from which loan requests are archived.
+      Defaults to `ARCHIVE_AFTER_DAYS`.
+    - `current_user` (User): The authenticated user (must be admin).
+
+    Returns:
+    - `dict`: Number of archived loan requests and the archived dates.
+    """
+    max_age_days = ARCHIVE_AFTER_DAYS if max_age_days is None else max_age_days
+    if max_age_days <= 0:
+        # ARCHIVE_AFTER_DAYS=0 disables archival, it does not mean "archive everything"
+        raise HTTPException(status_code=400, detail="Archival is disabled (ARCHIVE_AFTER_DAYS is 0)")
+    archived = await run_in_threadpool(archive_old_loan_requests, max_age_days)
+    dates = archived_dates()
+    return {
+        "archived": archived,
+        "oldest_partition": dates[0] if dates else None,
+        "newest_partition": dates[-1] if dates else None,
+    }
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
+from datetime import datetime, timezone
 from app.schemas.user import UserCreate, UserRead, UserUpdate  # Import schemas for user data handling
 from app.schemas.auth import Token, AuthData  # Import schemas for authentication data (Token, AuthData)
 from app.models.users import User  # Import the User model to interact with the database
+from app.models.tokens import RevokedToken  # Import the RevokedToken model to persist logouts
 from app.db.session import get_session  # Import the session dependency for database interaction
-from app.core.security import get_password_hash, verify_password, get_current_user  # Import security utilities
-from app.core.jwt_handler import create_access_token  # Import the JWT creation utility
+from app.core.security import get_password_hash, verify_password, get_current_user, oauth2_scheme  # Import security utilities
+from app.core.jwt_handler import create_access_token, verify_token  # Import the JWT utilities
+from app.core.token_denylist import token_denylist, to_timestamp  # Import the in-memory denylist of revoked tokens
 
 router = APIRouter()  # Initialize the router for authentication-related routes
 
@@ -191,18 +196,44 @@ async def reset_password(
     return {"success": True, "message": "Password reset successfully!"}
 
 @router.post("/auth/logout", response_model=dict)
-async def logout(response: Response):
+async def logout(
+    token: str = Depends(oauth2_scheme),  # Token to revoke, from the Authorization header
+    session: Session = Depends(get_session)  # Database session to interact with the database
+):
     """
-    Logout the current user by deleting the access token cookie.
+    Logout the current user by revoking their access token until it expires.
 
     Parameters:
-    - response (Response): The response object where the cookie will be deleted.
+    - token (str): The JWT token of the current user.
+    - session (Session): The session to interact with the database.
 
     Returns:
     - dict: Success message confirming the logout.
     """
-    # Delete the access token cookie
-    response.delete_cookie(key="access_token")
+    # Decode the token to retrieve its identifier and expiration time
+    payload = verify_token(token)
+    if payload is None or not payload.get("jti"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    jti = payload["jti"]
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc).replace(tzinfo=None)  # Stored as naive UTC
+
+    if not token_denylist.is_revoked(jti, session):
+        # Purge revocations of tokens that have expired, then persist this one
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        session.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            session.commit()
+        except IntegrityError:
+            # The token was already revoked by a concurrent logout
+            session.rollback()
+
+        token_denylist.add(jti, to_timestamp(expires_at))
     
     # Return a logout success message
     return {"message": "Logout successful"}
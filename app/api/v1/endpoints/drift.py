@@ -0,0 +1,76 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import TypeAdapter, ValidationError
+from sqlmodel import Session
+from typing import Optional
+from app.models.users import User
+from app.db.session import get_session
+from app.core.security import require_admin
+from app.utils.drift import BASELINE_WINDOW, window_start, load_sketches, save_sketches, compare_to_baseline
+
+# Initialize the router for drift monitoring routes
+router = APIRouter()
+
+_datetime_adapter = TypeAdapter(datetime)
+
+
+def _parse_window(value: str) -> str:
+    """
+    Returns the name of the window containing `value`, a date or datetime in any format
+    accepted for datetimes (e.g. `2026-10-19`, `2026-10-19T00:00:00Z`), in UTC unless it
+    has an offset. Raises a 400 error when `value` cannot be parsed.
+    """
+    try:
+        return window_start(_datetime_adapter.validate_python(value))
+    except ValidationError:
+        raise HTTPException(status_code=400, detail=f"Invalid window: {value!r} is not a date or datetime")
+
+
+@router.get("/admin/drift")
+def get_drift_report(
+    window: Optional[str] = None,
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session)
+):
+    """
+    Compare the distribution of the scored loan requests of a window with the baseline (admin only).
+
+    Parameters:
+    - `window` (str, optional): A date or datetime (ISO format, UTC unless an offset is given) within the window. Defaults to the current window.
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `dict`: PSI per feature, KS statistic for numeric features and approval rates.
+      Only the stored sketches are read, the `LoanRequests` table is not scanned.
+    """
+    window = _parse_window(window) if window is not None else window_start()
+    if not load_sketches(session, BASELINE_WINDOW):
+        raise HTTPException(status_code=404, detail="No drift baseline has been set")
+    return compare_to_baseline(session, window)
+
+
+@router.post("/admin/drift/baseline")
+def set_drift_baseline(
+    window: str,
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session)
+):
+    """
+    Use the sketches of a window as the reference distribution for drift reports (admin only).
+
+    Parameters:
+    - `window` (str): A date or datetime (ISO format, UTC unless an offset is given) within the window to use as baseline.
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `dict`: Success message.
+    """
+    window = _parse_window(window)
+    sketches = load_sketches(session, window)
+    if not sketches:
+        raise HTTPException(status_code=404, detail="No sketches recorded for this window")
+
+    save_sketches(session, BASELINE_WINDOW, sketches, replace=True)
+    return {"success": True, "message": f"Drift baseline set from window {window}"}
@@ -0,0 +1,109 @@
+import json
+import os
+from typing import List
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlmodel import Session, select
+from app.models.users import User
+from app.models.exports import ExportJob
+from app.schemas.export import ExportRequest
+from app.db.session import get_session
+from app.core.security import require_admin
+from app.utils.exports import export_worker
+
+# Initialize the router for export-related routes
+router = APIRouter()
+
+
+@router.post("/admin/exports", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+def submit_export(
+    request: ExportRequest,
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session)
+):
+    """
+    Submit an export of the loan requests, run in the background (admin only).
+
+    Parameters:
+    - `request` (ExportRequest): Output format (`parquet` or `csv.gz`), optional filters and
+      whether to include the username and email of the requesters.
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `ExportJob`: The pending job, to be polled with `GET /admin/exports/{job_id}`.
+    """
+    filters = {"user_id": request.user_id, "state": request.state, "prediction": request.prediction}
+    job = ExportJob(
+        requested_by=current_user.id,
+        format=request.format,
+        filters=json.dumps({key: value for key, value in filters.items() if value is not None}),
+        include_user=request.include_user,
+        created_at=datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+
+    export_worker.submit(job.id)
+    return job
+
+
+@router.get("/admin/exports", response_model=List[ExportJob])
+def list_exports(current_user: User = Depends(require_admin), session: Session = Depends(get_session)):
+    """
+    List the export jobs, most recent first (admin only).
+
+    Parameters:
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `List[ExportJob]`: The export jobs.
+    """
+    return session.exec(select(ExportJob).order_by(ExportJob.id.desc())).all()
+
+
+@router.get("/admin/exports/{job_id}", response_model=ExportJob)
+def get_export(job_id: int, current_user: User = Depends(require_admin), session: Session = Depends(get_session)):
+    """
+    Retrieve the status of an export job (admin only).
+
+    Parameters:
+    - `job_id` (int): ID of the export job.
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `ExportJob`: The job, with its status and row count.
+    """
+    job = session.get(ExportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@router.get("/admin/exports/{job_id}/download")
+def download_export(job_id: int, current_user: User = Depends(require_admin), session: Session = Depends(get_session)):
+    """
+    Download the file produced by a completed export job (admin only).
+
+    Parameters:
+    - `job_id` (int): ID of the export job.
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `FileResponse`: The Parquet or gzip-compressed CSV file.
+    """
+    job = session.get(ExportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Export job is {job.status}")
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export file no longer available")
+
+    media_type = "application/vnd.apache.parquet" if job.format == "parquet" else "application/gzip"
+    return FileResponse(job.file_path, media_type=media_type, filename=os.path.basename(job.file_path))
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+from datetime import datetime, timezone
 from app.core.security import get_current_user
 from app.db.session import get_session
 from sqlmodel import Session, select
 from app.models.users import User
 from app.models.loans import LoanRequests
+import asyncio
 import lightgbm
 import pandas as pd
 import pickle
 from app.core.jwt_handler import verify_token
+from app.utils.idempotency import idempotency_cache
+from app.utils.drift import drift_monitor
+from app.utils.archive import read_archived_loan_requests
 
 
 router = APIRouter()
@@ -19,12 +27,68 @@ with open("app/utils/final_model_pipeline.pkl", "rb") as file:
 
 request_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/loans/request")
 
+# Longest Idempotency-Key accepted (matches the LoanRequests.idempotency_key column)
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def _stored_prediction(value) -> bool:
+    """
+    Converts a prediction read back from the `LoanRequests.prediction` column to a boolean.
+    """
+    return str(value).lower() in ("1", "true")
+
+
+def _check_key_owner(owner_id: int, current_user_id: int):
+    """
+    Rejects an Idempotency-Key that was already used by another user.
+    """
+    if owner_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key already used by another request"
+        )
+
+
+async def _replay_idempotent_request(key: str, current_user_id: int, session: Session) -> Optional[bool]:
+    """
+    Looks up the prediction already returned for an Idempotency-Key.
+
+    The in-process cache is checked first. If another request with the same key is still
+    being scored, this waits for it to finish. Otherwise the `LoanRequests` table is queried
+    through the unique index on `idempotency_key`.
+
+    Returns:
+    - `bool` or `None`: The stored prediction, or `None` if the key has not been used yet.
+    """
+    while True:
+        cached = idempotency_cache.get(key)
+        if cached is not None:
+            owner_id, pred = cached
+            _check_key_owner(owner_id, current_user_id)
+            return pred
+
+        pending = idempotency_cache.in_flight(key)
+        if pending is None:
+            break
+        # Wait for the original request, then check the cache again
+        await asyncio.shield(pending)
+
+    existing = session.exec(select(LoanRequests).where(LoanRequests.idempotency_key == key)).first()
+    if existing is None:
+        return None
+
+    pred = _stored_prediction(existing.prediction)
+    idempotency_cache.put(key, existing.user_id, pred)
+    _check_key_owner(existing.user_id, current_user_id)
+    return pred
+
 
 @router.post("/loans/request")
 async def request_loan_and_predict(
     loan_request: LoanRequests,  # The loan request data to be processed.
     token: str = Depends(request_scheme),  # Token used to authenticate the user making the request.
-    session: Session = Depends(get_session)  # Dependency to access the database session.
+    session: Session = Depends(get_session),  # Dependency to access the database session.
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")  # Optional key identifying client retries.
 ):
     """
     Submits a loan request, predicts the loan approval status, 
@@ -34,6 +98,8 @@ async def request_loan_and_predict(
     - `loan_request` (LoanRequests): Data related to the loan request, such as loan amount, term, business sector, etc.
     - `token` (str): Token used to authenticate the user making the request.
     - `session` (Session): The database session for interacting with the database.
+    - `idempotency_key` (str, optional): Value of the `Idempotency-Key` header. A request repeating
+      a key already used returns the original prediction without scoring or recording it again.
 
     This function processes a loan request by first authenticating the user with the provided token. 
     It then uses the loan request data to predict the loan approval status using a pre-trained model 
@@ -44,6 +110,48 @@ async def request_loan_and_predict(
     current_user = get_current_user(token, session)
     current_user_id = current_user.id  # Use the current user's ID for database operations.
 
+    if idempotency_key is not None:
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters long"
+            )
+
+        # Return the original prediction if this key was already processed
+        previous = await _replay_idempotent_request(idempotency_key, current_user_id, session)
+        if previous is not None:
+            return previous
+        idempotency_cache.reserve(idempotency_key)
+
+    try:
+        pred = await _score_and_record(loan_request, current_user_id, idempotency_key, session)
+    except BaseException:
+        if idempotency_key is not None:
+            idempotency_cache.release(idempotency_key)
+        raise
+
+    if idempotency_key is not None:
+        idempotency_cache.release(idempotency_key, current_user_id, pred)
+
+    # Return the prediction result (True for approved, False for not approved).
+    return pred
+
+
+async def _score_and_record(
+    loan_request: LoanRequests,
+    current_user_id: int,
+    idempotency_key: Optional[str],
+    session: Session
+) -> bool:
+    """
+    Predicts the loan approval status and records the loan request in the database.
+
+    If another worker stored the same Idempotency-Key in the meantime, the unique index
+    rejects the insert and the prediction stored by that worker is returned instead.
+
+    Returns:
+    - `bool`: The prediction for the loan request.
+    """
     # Prepare the loan data to be passed into the prediction model.
     loan_data = {
         "GrAppv": [loan_request.GrAppv],
@@ -72,7 +180,8 @@ async def request_loan_and_predict(
     df_data["Rural"] = df_data["Rural"].astype("str")
 
     # Use the pre-trained model to predict whether the loan request is approved or not.
-    prediction = model.predict(df_data)
+    # Scoring runs in the thread pool so it does not block the event loop.
+    prediction = await run_in_threadpool(model.predict, df_data)
     pred = True if prediction[0] == 1 else False  # Convert the model's output to a boolean.
 
     # Create a new loan request entry in the database with the provided data and prediction result.
@@ -88,28 +197,54 @@ async def request_loan_and_predict(
         RevLineCr=loan_request.RevLineCr,
         LowDoc=loan_request.LowDoc,
         Rural=loan_request.Rural,
-        prediction=pred  # Store the prediction result in the database.
+        prediction=pred,  # Store the prediction result in the database.
+        idempotency_key=idempotency_key
     )
     
     # Save the loan request data to the database.
     session.add(loan_request_data)
-    session.commit()  # Commit the transaction to persist the data.
+    try:
+        session.commit()  # Commit the transaction to persist the data.
+    except IntegrityError:
+        session.rollback()
+        if idempotency_key is None:
+            raise
+
+        # A concurrent duplicate was committed first: answer with its stored prediction
+        existing = session.exec(
+            select(LoanRequests).where(LoanRequests.idempotency_key == idempotency_key)
+        ).first()
+        if existing is None:
+            raise
+        _check_key_owner(existing.user_id, current_user_id)
+        return _stored_prediction(existing.prediction)
+
+    # Feed the drift monitor (the sketches are updated in a background thread)
+    drift_monitor.record(loan_request_data, pred)
 
-    # Return the prediction result (True for approved, False for not approved).
     return pred
 
 
 @router.get("/loans/history")
-async def get_loan_history(token: str = Depends(request_scheme), session: Session = Depends(get_session)):
+async def get_loan_history(
+    start: Optional[datetime] = None,  # Only return loan requests submitted from this time (UTC).
+    end: Optional[datetime] = None,  # Only return loan requests submitted before this time (UTC).
+    token: str = Depends(request_scheme),
+    session: Session = Depends(get_session)
+):
     """
     Retrieves the loan history for the authenticated user or admin.
 
     Parameters:
+    - `start` (datetime, optional): Lower bound (inclusive) of the submission time.
+    - `end` (datetime, optional): Upper bound (exclusive) of the submission time.
     - `token` (str): Token used to authenticate the user making the request.
     
     This function verifies the provided token, retrieves the user associated with it,
     and returns a list of loan requests. If the user is an admin, all loan requests are returned.
     If the user is a regular user, only their own loan requests are returned.
+    Without `start`, only the loan requests still in the table are returned. Loan requests
+    moved to the archive are read only when `start` reaches into the archived dates.
     If no loan requests are found, a 404 error is raised.
     """
     # Retrieve the user from the token
@@ -117,15 +252,36 @@ async def get_loan_history(token: str = Depends(request_scheme), session: Sessio
     
     # Extract user_id from the authenticated user
     user_id = current_user.id
+
+    # Compare with the naive UTC timestamps stored in the database
+    start = start.astimezone(timezone.utc).replace(tzinfo=None) if start and start.tzinfo else start
+    end = end.astimezone(timezone.utc).replace(tzinfo=None) if end and end.tzinfo else end
     
     try:
+        statement = select(LoanRequests)
+        if start is not None:
+            statement = statement.where(LoanRequests.created_at >= start)
+        if end is not None:
+            statement = statement.where(LoanRequests.created_at < end)
+
         # Check if the user is an admin or a regular user
         if current_user.role == "admin":
             # Admins can see all loan requests
-            loans = session.exec(select(LoanRequests)).all()
+            loans = session.exec(statement.order_by(LoanRequests.id)).all()
         else:
             # Regular users can only see their own loan requests
-            loans = session.exec(select(LoanRequests).where(LoanRequests.user_id == user_id)).all()
+            loans = session.exec(statement.where(LoanRequests.user_id == user_id).order_by(LoanRequests.id)).all()
+
+        # The archive is only read for an explicit start (the partitions before it are skipped)
+        archived = []
+        if start is not None:
+            archived = read_archived_loan_requests(start, end, None if current_user.role == "admin" else user_id)
+
+        # Merge the archived loan requests (a row still in the table takes precedence)
+        if archived:
+            hot_ids = {loan.id for loan in loans}
+            archived_loans = [LoanRequests.model_validate(row) for row in archived if row["id"] not in hot_ids]
+            loans = sorted(archived_loans + list(loans), key=lambda loan: loan.id)
 
         # If no loan requests are found, raise a 404 error
         if not loans:
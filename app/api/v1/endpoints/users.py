@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
 from app.models.users import User
-from app.schemas.user import UserRead, UserCreate
+from app.schemas.user import UserRead, UserCreate, UserBulkResponse
 from app.db.session import get_session
 from app.core.jwt_handler import verify_token
-from app.core.security import get_password_hash, get_current_user
+from app.core.security import get_password_hash, get_current_user, require_admin
+from app.core.token_denylist import token_denylist
+from app.utils.user_provisioning import parse_user_rows, provision_users
 
 # Initialize the router for user-related routes
 router = APIRouter()
@@ -30,8 +33,8 @@ def read_users_me(
     """
     # Verify the JWT token and extract the payload
     payload = verify_token(token)
-    if payload is None:
-        # If the token is invalid or expired, return a 401 Unauthorized error
+    if payload is None or (payload.get("jti") and token_denylist.is_revoked(payload["jti"], session)):
+        # If the token is invalid, expired or revoked, return a 401 Unauthorized error
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
@@ -89,6 +92,37 @@ def create_user(user: UserCreate, session: Session = Depends(get_session)):
     return new_user
 
 
+@router.post("/admin/users/bulk", response_model=UserBulkResponse)
+async def bulk_create_users(
+    request: Request,
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session)
+):
+    """
+    Create many users at once from a CSV or JSON list (admin only).
+
+    The body is either a JSON list of users or, with a `text/csv` content type, a CSV file
+    with a header line. Each user has a `username`, an `email`, a `password` and an optional
+    `role`. Like `POST /admin/users`, the users are created inactive.
+
+    Parameters:
+    - `request` (Request): The request holding the CSV or JSON body.
+    - `current_user` (User): The authenticated user (must be admin).
+    - `session` (Session): Database session dependency.
+
+    Returns:
+    - `UserBulkResponse`: Number of created and failed users, and the result of each row.
+    """
+    fmt = "csv" if "csv" in request.headers.get("content-type", "") else "json"
+    try:
+        rows = parse_user_rows((await request.body()).decode("utf-8"), fmt)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {fmt.upper()} body: {e}")
+
+    # Hashing and inserting block, so they run in the thread pool
+    return await run_in_threadpool(provision_users, session, rows)
+
+
 @router.get("/admin/users")
 def get_users(current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
     """
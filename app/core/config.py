@@ -5,4 +5,31 @@ load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "ma_clé_secrète_changez_moi")
 ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
+
+# Number of recent Idempotency-Key values kept in memory for /loans/request
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "1024"))
+
+# How often (in seconds) each process reloads token revocations made by other workers
+TOKEN_DENYLIST_SYNC_SECONDS = float(os.getenv("TOKEN_DENYLIST_SYNC_SECONDS", "5"))
+
+# Drift monitoring: length of a sketch window (hours, a divisor of 24) and how often sketches are flushed to the database (seconds)
+DRIFT_WINDOW_HOURS = int(os.getenv("DRIFT_WINDOW_HOURS", "24"))
+DRIFT_FLUSH_SECONDS = float(os.getenv("DRIFT_FLUSH_SECONDS", "60"))
+
+# Export jobs: output directory, rows fetched per chunk and number of exports running at the same time
+EXPORT_DIR = os.getenv("EXPORT_DIR", "app/exports")
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+EXPORT_MAX_CONCURRENCY = int(os.getenv("EXPORT_MAX_CONCURRENCY", "1"))
+# Interval (seconds) at which running exports report they are alive; silent for 5 intervals means abandoned
+EXPORT_HEARTBEAT_SECONDS = float(os.getenv("EXPORT_HEARTBEAT_SECONDS", "30"))
+
+# Archival of old loan requests: age (days, 0 disables), output directory, rows moved per transaction and run interval (hours)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "app/archive")
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+ARCHIVE_INTERVAL_HOURS = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24"))
+
+# Bulk user provisioning: processes hashing passwords (0 = one per CPU) and users inserted per transaction
+BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", "0"))
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta, timezone
+import uuid
 import jwt
 from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 def create_access_token(data: dict) -> str:
     """
-    Creates a JWT token with an expiration time and the provided data.
+    Creates a JWT token with an expiration time, a unique identifier (`jti`) and the provided data.
     
     Parameters:
     - `data` (dict): Information to encode in the JWT token.
@@ -14,7 +15,7 @@ def create_access_token(data: dict) -> str:
     """
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))  # Set expiration time
-    to_encode.update({"exp": expire})  # Add expiration field
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})  # Add expiration field and token ID (used for revocation)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)  # Encode token
     return encoded_jwt
 
@@ -7,6 +7,7 @@ from sqlmodel import select
 from app.db.session import get_session
 from jose import jwt, JWTError
 from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.token_denylist import token_denylist
 
 # Password hashing context (bcrypt)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -51,7 +52,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     - `User`: The authenticated user object.
 
     Raises:
-    - `HTTPException`: If the token is invalid or expired.
+    - `HTTPException`: If the token is invalid, expired or revoked.
     """
     try:
         # Decode the JWT token
@@ -61,6 +62,11 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         if not username:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+        # Reject tokens revoked through /auth/logout (in-memory lookup)
+        jti = payload.get("jti")
+        if jti and token_denylist.is_revoked(jti, db):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
         # Fetch user from the database based on username
         statement = select(User).where(User.username == username)
         result = db.execute(statement).first()
@@ -72,3 +78,21 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         return user
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Ensures the authenticated user is an admin.
+
+    Parameters:
+    - `current_user`: The authenticated user.
+
+    Returns:
+    - `User`: The authenticated admin.
+
+    Raises:
+    - `HTTPException`: If the user is not an admin.
+    """
+    if not current_user or current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    return current_user
@@ -0,0 +1,92 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict
+from sqlmodel import Session, select
+from app.models.tokens import RevokedToken
+from app.core.config import TOKEN_DENYLIST_SYNC_SECONDS
+
+
+def to_timestamp(value: datetime) -> float:
+    """
+    Converts a datetime read from the database to a POSIX timestamp.
+    Naive datetimes (as returned by SQLite) are assumed to be UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TokenDenylist:
+    """
+    In-process set of revoked token identifiers (`jti`), each kept until the token expires.
+
+    Checking a token is a dictionary lookup. Revocations made by other workers are picked
+    up by reloading the unexpired `RevokedToken` rows at most once every `sync_interval`
+    seconds, so the database is not queried on every authenticated request.
+    """
+
+    def __init__(self, sync_interval: float = TOKEN_DENYLIST_SYNC_SECONDS):
+        self.sync_interval = sync_interval
+        self._expiry: Dict[str, float] = {}   # jti -> expiration timestamp
+        self._last_sync = None                # Monotonic time of the last reload
+        self._lock = threading.Lock()         # Dependencies may run in the thread pool
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """
+        Marks the token `jti` as revoked until `expires_at` (POSIX timestamp).
+        """
+        with self._lock:
+            self._expiry[jti] = expires_at
+
+    def is_revoked(self, jti: str, db: Session) -> bool:
+        """
+        Checks whether the token `jti` has been revoked.
+
+        Parameters:
+        - `jti`: The `jti` claim of the token.
+        - `db`: The database session, used only when the denylist is due for a reload.
+
+        Returns:
+        - `bool`: True if the token has been revoked, False otherwise.
+        """
+        self._sync(db)
+        expires_at = self._expiry.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            # The token has expired anyway, no need to remember it
+            with self._lock:
+                self._expiry.pop(jti, None)
+            return False
+        return True
+
+    def _sync(self, db: Session) -> None:
+        """
+        Reloads the revocations of unexpired tokens from the database.
+        """
+        now = time.monotonic()
+        if self._last_sync is not None and now - self._last_sync < self.sync_interval:
+            return
+
+        with self._lock:
+            # Another thread may have reloaded while we were waiting for the lock
+            if self._last_sync is not None and now - self._last_sync < self.sync_interval:
+                return
+
+            current_time = datetime.now(timezone.utc).replace(tzinfo=None)  # Stored as naive UTC
+            statement = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > current_time)
+            expiry = {jti: to_timestamp(expires_at) for jti, expires_at in db.exec(statement)}
+
+            # Keep revocations added locally but not visible to this session yet
+            current_timestamp = time.time()
+            for jti, expires_at in self._expiry.items():
+                if jti not in expiry and expires_at > current_timestamp:
+                    expiry[jti] = expires_at
+
+            self._expiry = expiry
+            self._last_sync = now
+
+
+# Shared denylist used by the authentication dependencies
+token_denylist = TokenDenylist()
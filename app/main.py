@@ -1,8 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.v1.endpoints import auth, users, loans
+from app.api.v1.endpoints import auth, users, loans, drift, exports, archive
+from app.utils.drift import drift_monitor
+from app.utils.exports import export_worker
+from app.utils.archive import archive_scheduler
+from app.utils.user_provisioning import shutdown_hash_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the background workers, and stop them (flushing their state) on shutdown
+    drift_monitor.start()
+    export_worker.start()
+    archive_scheduler.start()
+    yield
+    archive_scheduler.stop()
+    export_worker.stop()
+    drift_monitor.stop()
+    shutdown_hash_pool()
 
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Prediction Service",
     description="Online service for predicting the approval of a bank loan",
     openapi_tags=[
@@ -24,4 +43,7 @@ app = FastAPI(
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 app.include_router(users.router, prefix="/api/v1", tags=["users"])
 app.include_router(loans.router, prefix="/api/v1", tags=["loans"])
+app.include_router(drift.router, prefix="/api/v1", tags=["admin"])
+app.include_router(exports.router, prefix="/api/v1", tags=["admin"])
+app.include_router(archive.router, prefix="/api/v1", tags=["admin"])
 
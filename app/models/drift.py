@@ -0,0 +1,26 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
+from typing import Optional
+from datetime import datetime
+
+class FeatureSketch(SQLModel, table=True):
+    """
+    Model storing the streaming sketch of one feature of the scored loan requests for a time window.
+
+    Attributes:
+    - `id`: Unique identifier for the sketch (primary key).
+    - `window`: Start of the window (ISO format, UTC), or "baseline" for the reference distribution.
+    - `feature`: Name of the feature (a `LoanRequests` column, or "prediction").
+    - `worker`: Process that wrote the sketch. Each process only updates its own rows, and
+      the rows of all processes are merged when the window is read.
+    - `sketch`: JSON-serialized sketch (quantile buckets or frequency counts).
+    - `updated_at`: Last time the sketch was flushed (UTC).
+    """
+    __table_args__ = (UniqueConstraint("window", "feature", "worker"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    window: str = Field(index=True)
+    feature: str
+    worker: str = Field(default="")
+    sketch: str
+    updated_at: datetime
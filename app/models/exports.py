@@ -0,0 +1,36 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class ExportJob(SQLModel, table=True):
+    """
+    Model representing an asynchronous export of the loan requests.
+
+    Attributes:
+    - `id`: Unique identifier for the job (primary key).
+    - `requested_by`: ID of the admin who submitted the job.
+    - `status`: "pending", "running", "completed" or "failed".
+    - `format`: Output format, "parquet" or "csv.gz".
+    - `filters`: JSON-serialized filters applied to the loan requests.
+    - `include_user`: Whether the username and email of the requester are joined to each row.
+    - `row_count`: Number of rows written so far.
+    - `file_path`: Path of the produced file, once completed.
+    - `error`: Error message, if the job failed.
+    - `owner`: Process running the job ("<hostname>:<pid>").
+    - `heartbeat_at`: Last time the owner reported the job as alive (UTC).
+    - `created_at`, `started_at`, `finished_at`: Timestamps of the job (UTC).
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    requested_by: int = Field(foreign_key="user.id")
+    status: str = Field(default="pending", index=True)
+    format: str = Field(default="parquet")
+    filters: str = Field(default="{}")
+    include_user: bool = Field(default=False)
+    row_count: int = Field(default=0)
+    file_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    owner: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
@@ -1,7 +1,6 @@
 from sqlmodel import SQLModel, Field, Relationship
-from app.models.users import User
-
-from sqlmodel import SQLModel, Field, Relationship
+from typing import Optional
+from datetime import datetime, timezone
 from app.models.users import User
 
 class LoanRequests(SQLModel, table=True):
@@ -21,5 +20,9 @@ class LoanRequests(SQLModel, table=True):
     LowDoc: str                                                 # Low documentation request ('Yes' or 'No')
     Rural: str                                                  # Rural area loan request ('Yes' or 'No')
     prediction: str                                             # Predicted loan outcome (approved/rejected)
+    idempotency_key: Optional[str] = Field(default=None, unique=True, index=True, max_length=255)  # Client-supplied Idempotency-Key header
+    created_at: Optional[datetime] = Field(                     # Submission time (UTC), used for archival
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None), index=True
+    )
 
     user: User = Relationship(back_populates="loan_requests")   # Relationship to User model
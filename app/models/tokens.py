@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class RevokedToken(SQLModel, table=True):
+    """
+    Model representing a revoked JWT access token.
+
+    Attributes:
+    - `id`: Unique identifier for the revocation (primary key).
+    - `jti`: Unique identifier (`jti` claim) of the revoked token.
+    - `expires_at`: Expiration time of the token (UTC), after which the row can be purged.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    jti: str = Field(unique=True, index=True)
+    expires_at: datetime = Field(index=True)
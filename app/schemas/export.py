@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Optional, Literal
+
+class ExportRequest(BaseModel):
+    format: Literal["parquet", "csv.gz"] = "parquet"
+    user_id: Optional[int] = None
+    state: Optional[str] = None
+    prediction: Optional[bool] = None
+    include_user: bool = False
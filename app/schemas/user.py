@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List, Literal
 
 class UserBase(BaseModel):
     username: str
@@ -15,4 +15,19 @@ class UserRead(UserBase):
 class UserUpdate(BaseModel):
     username: Optional[str]
     email: Optional[EmailStr]
-    password: Optional[str]
\ No newline at end of file
+    password: Optional[str]
+
+class UserBulkItem(UserCreate):
+    role: Literal["user", "admin"] = "user"
+
+class UserBulkResult(BaseModel):
+    row: int
+    username: Optional[str] = None
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class UserBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[UserBulkResult]
@@ -0,0 +1,218 @@
+import os
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import delete, select, update
+from sqlmodel import Session
+from app.db.session import engine
+from app.models.loans import LoanRequests
+from app.core.config import ARCHIVE_AFTER_DAYS, ARCHIVE_DIR, ARCHIVE_BATCH_SIZE, ARCHIVE_INTERVAL_HOURS
+
+# Archived loan requests are stored as ARCHIVE_DIR/loan_requests/date=YYYY-MM-DD/part-<first id>-<last id>.parquet
+ARCHIVE_TABLE_DIR = os.path.join(ARCHIVE_DIR, "loan_requests")
+PARTITION_PREFIX = "date="
+
+# Serializes the runs of this process (the scheduler and POST /admin/archive)
+_archive_lock = threading.Lock()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)  # Stored as naive UTC
+
+
+def archived_dates() -> List[date]:
+    """
+    Returns the dates of the archived partitions, oldest first.
+    """
+    if not os.path.isdir(ARCHIVE_TABLE_DIR):
+        return []
+    dates = []
+    for name in os.listdir(ARCHIVE_TABLE_DIR):
+        if name.startswith(PARTITION_PREFIX):
+            dates.append(date.fromisoformat(name[len(PARTITION_PREFIX):]))
+    return sorted(dates)
+
+
+def _write_partition(day: date, df: pd.DataFrame) -> None:
+    """
+    Writes the rows of one day to a zstd-compressed Parquet file of its partition.
+
+    The file is named after the range of IDs it holds, so archiving the same batch again
+    after an interruption overwrites the file instead of duplicating the rows.
+    """
+    partition_dir = os.path.join(ARCHIVE_TABLE_DIR, f"{PARTITION_PREFIX}{day.isoformat()}")
+    os.makedirs(partition_dir, exist_ok=True)
+    file_path = os.path.join(partition_dir, f"part-{df['id'].min()}-{df['id'].max()}.parquet")
+    # Unique per writer, as the workers may archive the same batch at the same time
+    tmp_path = f"{file_path}.{os.getpid()}-{uuid.uuid4().hex}.part"
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="zstd")
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def backfill_created_at() -> int:
+    """
+    Sets `created_at` to the current time for the loan requests that have none (rows written
+    before the column existed), so that they are eventually archived and returned by the
+    history queries bounded by `start`/`end`.
+
+    Returns:
+    - `int`: Number of updated loan requests.
+    """
+    with Session(engine) as session:
+        result = session.execute(
+            update(LoanRequests).where(LoanRequests.created_at.is_(None)).values(created_at=_utcnow())
+        )
+        session.commit()
+        return result.rowcount
+
+
+def archive_old_loan_requests(max_age_days: int = ARCHIVE_AFTER_DAYS, stop_event: Optional[threading.Event] = None) -> int:
+    """
+    Moves the loan requests older than `max_age_days` from the `LoanRequests` table to
+    date-partitioned Parquet files, `ARCHIVE_BATCH_SIZE` rows per transaction.
+
+    Each batch is written to disk before it is deleted from the table, so an interrupted
+    run loses no data. Runs of the same process wait for each other; runs of different
+    processes may archive the same batch, which then overwrites the same file.
+
+    Parameters:
+    - `max_age_days` (int): Age (in days) from which loan requests are archived.
+    - `stop_event` (threading.Event, optional): Stops the run between two batches when set.
+
+    Returns:
+    - `int`: Number of archived loan requests.
+    """
+    with _archive_lock:
+        backfill_created_at()
+        cutoff = _utcnow() - timedelta(days=max_age_days)
+        columns = list(LoanRequests.__table__.columns)
+        archived = 0
+
+        while stop_event is None or not stop_event.is_set():
+            with Session(engine) as session:
+                statement = (
+                    select(*columns)
+                    .where(LoanRequests.created_at < cutoff)
+                    .order_by(LoanRequests.id)
+                    .limit(ARCHIVE_BATCH_SIZE)
+                )
+                result = session.execute(statement)
+                df = pd.DataFrame(result.all(), columns=list(result.keys()))
+                if df.empty:
+                    return archived
+
+                for day, rows in df.groupby(df["created_at"].dt.date):
+                    _write_partition(day, rows)
+
+                session.execute(delete(LoanRequests).where(LoanRequests.id.in_(df["id"].tolist())))
+                session.commit()
+                archived += len(df)
+
+        return archived
+
+
+def iter_archived_tables(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    filters: Optional[list] = None
+) -> Iterator[pa.Table]:
+    """
+    Yields the archived loan requests one Parquet file at a time, oldest partition first.
+
+    Parameters:
+    - `start` (datetime, optional): Skip the partitions of the days before `start`.
+    - `end` (datetime, optional): Skip the partitions of the days after `end`.
+    - `filters` (list, optional): Row filters, in the `pyarrow.parquet.read_table` format.
+    """
+    for day in archived_dates():
+        if (start is not None and day < start.date()) or (end is not None and day > end.date()):
+            continue
+        partition_dir = os.path.join(ARCHIVE_TABLE_DIR, f"{PARTITION_PREFIX}{day.isoformat()}")
+        for name in sorted(os.listdir(partition_dir)):
+            if name.endswith(".parquet"):
+                yield pq.read_table(os.path.join(partition_dir, name), filters=filters or None)
+
+
+def read_archived_loan_requests(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user_id: Optional[int] = None
+) -> List[dict]:
+    """
+    Reads the archived loan requests created between `start` and `end` (naive UTC).
+
+    Only the partitions whose date falls within the range are opened, so a range that does
+    not reach into the archive costs a directory listing. Without `start`, every partition
+    up to `end` is read: callers on a hot path should always give a `start`.
+
+    Parameters:
+    - `start` (datetime, optional): Lower bound (inclusive) of `created_at`.
+    - `end` (datetime, optional): Upper bound (exclusive) of `created_at`.
+    - `user_id` (int, optional): Only return the loan requests of this user.
+
+    Returns:
+    - `List[dict]`: The archived loan requests, ordered by ID.
+    """
+    filters = []
+    if start is not None:
+        filters.append(("created_at", ">=", start))
+    if end is not None:
+        filters.append(("created_at", "<", end))
+    if user_id is not None:
+        filters.append(("user_id", "=", user_id))
+
+    tables = list(iter_archived_tables(start, end, filters))
+    if not tables:
+        return []
+    df = pa.concat_tables(tables, promote_options="default").to_pandas()
+    df = df.drop_duplicates(subset="id").sort_values("id")
+    df = df.astype(object).where(df.notna(), None)  # NaN/NaT -> None
+    return df.to_dict(orient="records")
+
+
+class ArchiveScheduler:
+    """
+    Runs `archive_old_loan_requests` in a background thread every `ARCHIVE_INTERVAL_HOURS`.
+    Disabled when `ARCHIVE_AFTER_DAYS` is 0.
+    """
+
+    def __init__(self, interval_hours: float = ARCHIVE_INTERVAL_HOURS):
+        self.interval_hours = interval_hours
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        # Date the rows written before created_at existed, even when archival is disabled
+        backfill_created_at()
+        if ARCHIVE_AFTER_DAYS <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="archive-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                archive_old_loan_requests(stop_event=self._stop)
+            except Exception as e:
+                print(f"Error archiving loan requests: {e}")
+            self._stop.wait(self.interval_hours * 3600)
+
+
+# Shared scheduler started with the application
+archive_scheduler = ArchiveScheduler()
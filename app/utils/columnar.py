@@ -0,0 +1,32 @@
+from datetime import datetime
+import pyarrow as pa
+
+# Arrow types of the Python types of the database columns
+_ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    str: pa.string(),
+    datetime: pa.timestamp("us"),
+}
+
+
+def arrow_schema(columns) -> pa.Schema:
+    """
+    Builds the Arrow schema of a list of SQLAlchemy columns from their declared types, so that
+    a file has the same schema whatever the data (e.g. a chunk where a column is all NULL).
+
+    Parameters:
+    - `columns`: The selected columns (e.g. `statement.selected_columns`).
+
+    Returns:
+    - `pa.Schema`: One nullable field per column, strings for unknown types.
+    """
+    fields = []
+    for column in columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = str
+        fields.append(pa.field(column.name, _ARROW_TYPES.get(python_type, pa.string())))
+    return pa.schema(fields)
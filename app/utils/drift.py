@@ -0,0 +1,243 @@
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from app.db.session import engine
+from app.models.drift import FeatureSketch
+from app.utils.sketches import (
+    QuantileSketch, FrequencySketch, sketch_from_dict, categorical_psi, numeric_psi, numeric_ks
+)
+from app.core.config import DRIFT_WINDOW_HOURS, DRIFT_FLUSH_SECONDS
+
+# Features monitored with a quantile sketch and with frequency counts
+NUMERIC_FEATURES = ("GrAppv", "Term", "NoEmp")
+CATEGORICAL_FEATURES = ("State", "NAICS_Sectors", "New", "Franchise", "RevLineCr", "LowDoc", "Rural")
+PREDICTION_FEATURE = "prediction"
+
+# Name of the window holding the reference distribution
+BASELINE_WINDOW = "baseline"
+
+# PSI above which a feature is reported as drifting (usual rule of thumb)
+PSI_ALERT_THRESHOLD = 0.2
+
+# Values of the Yes/No flags, normalized so that "1", "1.0", "Y" and "Yes" are counted together
+_FLAG_VALUES = {"1": "Yes", "1.0": "Yes", "y": "Yes", "yes": "Yes", "true": "Yes",
+                "0": "No", "0.0": "No", "n": "No", "no": "No", "false": "No"}
+
+_STOP = object()  # Sentinel stopping the worker thread
+
+# Identifies the sketch rows written by this process
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def window_start(moment: Optional[datetime] = None) -> str:
+    """
+    Returns the name of the window containing `moment` (default: now), i.e. its start in ISO format (UTC).
+    A naive `moment` is taken as UTC.
+    """
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    hour = moment.hour - moment.hour % DRIFT_WINDOW_HOURS if DRIFT_WINDOW_HOURS < 24 else 0
+    return moment.replace(hour=hour, minute=0, second=0, microsecond=0, tzinfo=None).isoformat()
+
+
+def _category(value) -> str:
+    text = str(value).strip()
+    return _FLAG_VALUES.get(text.lower(), text)
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def new_sketches() -> dict:
+    """
+    Returns empty sketches for every monitored feature.
+    """
+    sketches = {feature: QuantileSketch() for feature in NUMERIC_FEATURES}
+    sketches.update({feature: FrequencySketch() for feature in CATEGORICAL_FEATURES + (PREDICTION_FEATURE,)})
+    return sketches
+
+
+def load_sketches(session: Session, window: str) -> dict:
+    """
+    Loads the sketches stored for `window` by all processes, merged as a dictionary feature -> sketch.
+    """
+    sketches = {}
+    for row in session.exec(select(FeatureSketch).where(FeatureSketch.window == window)):
+        sketch = sketch_from_dict(json.loads(row.sketch))
+        if row.feature in sketches:
+            sketches[row.feature].merge(sketch)
+        else:
+            sketches[row.feature] = sketch
+    return sketches
+
+
+def save_sketches(session: Session, window: str, sketches: dict, worker: str = WORKER_ID, replace: bool = False) -> None:
+    """
+    Adds `sketches` to the rows of `worker` for `window` and commits.
+
+    Only the flush thread of a process writes its rows, so the read-modify-write never races
+    with another process. With `replace`, the rows of every worker for `window` are replaced
+    by a single set of rows.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if replace:
+        session.execute(delete(FeatureSketch).where(FeatureSketch.window == window))
+        existing = {}
+    else:
+        rows = session.exec(
+            select(FeatureSketch).where(FeatureSketch.window == window, FeatureSketch.worker == worker)
+        ).all()
+        existing = {row.feature: row for row in rows}
+
+    for feature, sketch in sketches.items():
+        row = existing.get(feature)
+        if row is None:
+            row = FeatureSketch(window=window, feature=feature, worker=worker, sketch="{}", updated_at=now)
+        else:
+            stored = sketch_from_dict(json.loads(row.sketch))
+            stored.merge(sketch)
+            sketch = stored
+        row.sketch = json.dumps(sketch.to_dict())
+        row.updated_at = now
+        session.add(row)
+    session.commit()
+
+
+def compare_to_baseline(session: Session, window: str) -> dict:
+    """
+    Compares the sketches of `window` with the stored baseline.
+
+    Returns:
+    - `dict`: Request counts, approval rates and, for each feature, the PSI (and the KS statistic
+      for numeric features) between the baseline and the window.
+    """
+    baseline = load_sketches(session, BASELINE_WINDOW)
+    current = load_sketches(session, window)
+    empty = new_sketches()
+
+    def approval_rate(sketches: dict) -> Optional[float]:
+        predictions = sketches.get(PREDICTION_FEATURE, empty[PREDICTION_FEATURE])
+        return predictions.counts["approved"] / predictions.count if predictions.count else None
+
+    features = {}
+    for feature in NUMERIC_FEATURES + CATEGORICAL_FEATURES + (PREDICTION_FEATURE,):
+        expected = baseline.get(feature, empty[feature])
+        actual = current.get(feature, empty[feature])
+        if feature in NUMERIC_FEATURES:
+            psi = numeric_psi(expected, actual)
+            report = {"psi": psi, "ks": numeric_ks(expected, actual)}
+        else:
+            psi = categorical_psi(expected, actual)
+            report = {"psi": psi}
+        report["drift"] = psi is not None and psi >= PSI_ALERT_THRESHOLD
+        features[feature] = report
+
+    return {
+        "window": window,
+        "baseline_requests": baseline.get(PREDICTION_FEATURE, empty[PREDICTION_FEATURE]).count,
+        "window_requests": current.get(PREDICTION_FEATURE, empty[PREDICTION_FEATURE]).count,
+        "approval_rate": {"baseline": approval_rate(baseline), "window": approval_rate(current)},
+        "features": features,
+    }
+
+
+class DriftMonitor:
+    """
+    Streams the features of scored loan requests into per-window sketches.
+
+    `record` only queues the raw values, so the request path pays one queue insertion.
+    A background thread updates the sketches and periodically adds them to the
+    `FeatureSketch` rows of this process for their window. Each process has its own rows,
+    which are merged when a window is read, so several workers share a window without
+    overwriting each other's counts.
+    """
+
+    def __init__(self, flush_interval: float = DRIFT_FLUSH_SECONDS):
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._pending: Dict[str, dict] = {}  # window -> sketches not flushed yet (worker thread only)
+        self._thread = None
+
+    def record(self, loan_request, prediction: bool) -> None:
+        """
+        Queues a scored loan request for the drift sketches.
+
+        Parameters:
+        - `loan_request`: The scored loan request (any object with the `LoanRequests` feature attributes).
+        - `prediction` (bool): The prediction returned for the request.
+        """
+        values = {feature: getattr(loan_request, feature, None) for feature in NUMERIC_FEATURES + CATEGORICAL_FEATURES}
+        self._queue.put((datetime.now(timezone.utc), values, prediction))
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the worker thread after flushing the pending sketches.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush()
+                return
+            if item is not None:
+                self._update(*item)
+            if time.monotonic() >= next_flush:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _update(self, received_at: datetime, values: dict, prediction: bool) -> None:
+        window = window_start(received_at)
+        sketches = self._pending.get(window)
+        if sketches is None:
+            sketches = self._pending[window] = new_sketches()
+
+        for feature in NUMERIC_FEATURES:
+            number = _number(values[feature])
+            if number is not None:
+                sketches[feature].add(number)
+        for feature in CATEGORICAL_FEATURES:
+            sketches[feature].add(_category(values[feature]))
+        sketches[PREDICTION_FEATURE].add("approved" if prediction else "rejected")
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for window, sketches in pending.items():
+            try:
+                with Session(engine) as session:
+                    save_sketches(session, window, sketches)
+            except Exception as e:
+                print(f"Error flushing drift sketches: {e}")
+                # Keep the counts for the next flush
+                for feature, sketch in sketches.items():
+                    self._pending.setdefault(window, new_sketches())[feature].merge(sketch)
+
+
+# Shared monitor fed by the loan request endpoint
+drift_monitor = DriftMonitor()
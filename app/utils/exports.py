@@ -0,0 +1,323 @@
+import gzip
+import json
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, update
+from sqlmodel import Session
+from app.db.session import engine
+from app.models.loans import LoanRequests
+from app.models.users import User
+from app.models.exports import ExportJob
+from app.utils.archive import iter_archived_tables
+from app.utils.columnar import arrow_schema
+from app.core.config import EXPORT_DIR, EXPORT_CHUNK_SIZE, EXPORT_MAX_CONCURRENCY, EXPORT_HEARTBEAT_SECONDS
+
+# Values of LoanRequests.prediction meaning approved / rejected (depending on the database driver)
+APPROVED_VALUES = ("1", "true", "True")
+REJECTED_VALUES = ("0", "false", "False")
+
+# Identifies the jobs claimed by this process
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)  # Stored as naive UTC
+
+
+def build_export_query(filters: dict, include_user: bool):
+    """
+    Builds the query selecting the loan requests to export, ordered by ID.
+
+    Parameters:
+    - `filters` (dict): Optional `user_id`, `state` and `prediction` filters.
+    - `include_user` (bool): Whether to join the username and email of the requester.
+    """
+    columns = list(LoanRequests.__table__.columns)
+    if include_user:
+        statement = select(*columns, User.username, User.email).join(User, LoanRequests.user_id == User.id)
+    else:
+        statement = select(*columns)
+
+    if filters.get("user_id") is not None:
+        statement = statement.where(LoanRequests.user_id == filters["user_id"])
+    if filters.get("state") is not None:
+        statement = statement.where(LoanRequests.State == filters["state"])
+    if filters.get("prediction") is not None:
+        values = APPROVED_VALUES if filters["prediction"] else REJECTED_VALUES
+        statement = statement.where(LoanRequests.prediction.in_(values))
+
+    return statement.order_by(LoanRequests.id)
+
+
+def _archived_chunks(connection, filters: dict, include_user: bool, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    Yields the archived loan requests matching `filters`, one archive file at a time, with
+    the same columns as the export query.
+    """
+    arrow_filters = []
+    if filters.get("user_id") is not None:
+        arrow_filters.append(("user_id", "=", filters["user_id"]))
+    if filters.get("state") is not None:
+        arrow_filters.append(("State", "=", filters["state"]))
+    if filters.get("prediction") is not None:
+        arrow_filters.append(("prediction", "in", list(APPROVED_VALUES if filters["prediction"] else REJECTED_VALUES)))
+
+    for table in iter_archived_tables(filters=arrow_filters):
+        df = table.to_pandas()
+        if df.empty:
+            continue
+
+        # Skip the rows still in the table (archival interrupted between writing and deleting),
+        # they are exported with the table rows
+        hot_ids = set(connection.execute(
+            select(LoanRequests.id).where(LoanRequests.id.between(int(df["id"].min()), int(df["id"].max())))
+        ).scalars())
+        df = df[~df["id"].isin(hot_ids)]
+
+        if include_user and not df.empty:
+            users = connection.execute(
+                select(User.id, User.username, User.email).where(User.id.in_(df["user_id"].unique().tolist()))
+            ).all()
+            df = df.merge(pd.DataFrame(users, columns=["user_id", "username", "email"]), on="user_id", how="inner")
+
+        if not df.empty:
+            yield df.reindex(columns=columns)
+
+
+class _ParquetWriter:
+    """
+    Writes chunks to a zstd-compressed Parquet file, one row group per chunk.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema):
+        self.schema = schema
+        self._writer = pq.ParquetWriter(path, schema, compression="zstd")
+
+    def write(self, df: pd.DataFrame) -> None:
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _CsvGzipWriter:
+    """
+    Writes chunks to a gzip-compressed CSV file with a single header line.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema):
+        self._file = gzip.open(path, "wt", newline="")
+        self._header = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        df.to_csv(self._file, index=False, header=self._header)
+        self._header = False
+
+    def close(self) -> None:
+        self._file.close()
+
+
+WRITERS = {"parquet": _ParquetWriter, "csv.gz": _CsvGzipWriter}
+
+
+class _Heartbeat:
+    """
+    Refreshes `heartbeat_at` of a running job every `EXPORT_HEARTBEAT_SECONDS` in a background
+    thread, and sets `lost` if the job no longer belongs to this process (it was reaped).
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"export-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(EXPORT_HEARTBEAT_SECONDS):
+            try:
+                with Session(engine) as session:
+                    result = session.execute(
+                        update(ExportJob)
+                        .where(ExportJob.id == self.job_id, ExportJob.owner == WORKER_ID, ExportJob.status == "running")
+                        .values(heartbeat_at=_utcnow())
+                    )
+                    session.commit()
+            except Exception as e:
+                print(f"Error refreshing heartbeat of export job {self.job_id}: {e}")
+                continue
+            if result.rowcount != 1:
+                self.lost = True
+                return
+
+
+def _finish_job(session: Session, job_id: int, **values) -> bool:
+    """
+    Records the outcome of a job, unless it no longer belongs to this process.
+
+    Returns:
+    - `bool`: True if the job was updated.
+    """
+    result = session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id, ExportJob.owner == WORKER_ID, ExportJob.status == "running")
+        .values(finished_at=_utcnow(), **values)
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def run_export(job_id: int) -> None:
+    """
+    Runs an export job: writes the matching archived loan requests, then streams those of the
+    table from a server-side cursor in chunks of `EXPORT_CHUNK_SIZE` rows, to a compressed file
+    in `EXPORT_DIR`.
+
+    Parameters:
+    - `job_id` (int): ID of the `ExportJob` to run.
+    """
+    with Session(engine) as session:
+        # Claim the job atomically, in case several processes try to run it
+        now = _utcnow()
+        claim = (
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == "pending")
+            .values(status="running", owner=WORKER_ID, started_at=now, heartbeat_at=now)
+        )
+        if session.execute(claim).rowcount != 1:
+            session.rollback()
+            return
+        session.commit()
+        job = session.get(ExportJob, job_id)
+
+        file_path = os.path.join(EXPORT_DIR, f"loan_requests_{job.id}.{job.format}")
+        tmp_path = file_path + ".part"  # Renamed once complete, so partial files are never served
+
+        try:
+            with _Heartbeat(job.id) as heartbeat:
+                os.makedirs(EXPORT_DIR, exist_ok=True)
+                filters = json.loads(job.filters)
+                statement = build_export_query(filters, job.include_user)
+
+                # The schema comes from the column types, not from the data of the first chunk
+                writer = WRITERS[job.format](tmp_path, arrow_schema(statement.selected_columns))
+                try:
+                    row_count = 0
+                    columns = [column.name for column in statement.selected_columns]
+                    with engine.connect() as connection:
+                        # Archived loan requests first (they are the oldest), then those in the table
+                        for df in _archived_chunks(connection, filters, job.include_user, columns):
+                            if heartbeat.lost:
+                                raise RuntimeError("Export job was reassigned")
+                            writer.write(df)
+                            row_count += len(df)
+
+                        result = connection.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_SIZE).execute(statement)
+                        for rows in result.partitions():
+                            if heartbeat.lost:
+                                raise RuntimeError("Export job was reassigned")
+                            writer.write(pd.DataFrame(rows, columns=columns))
+                            row_count += len(rows)
+                    if row_count == 0:
+                        # Write the header / schema of an empty export
+                        writer.write(pd.DataFrame(columns=columns))
+                finally:
+                    writer.close()
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            _finish_job(session, job_id, status="failed", error=str(e))
+        else:
+            if not _finish_job(session, job_id, status="completed", row_count=row_count, file_path=file_path):
+                # The job was reaped while we were writing it: do not leave an orphan file
+                os.remove(file_path)
+
+
+def _owner_is_gone(job: ExportJob, stale_before: datetime) -> bool:
+    """
+    Checks whether the process running `job` has stopped: either it ran on this host and
+    its process no longer exists, or it has not refreshed the heartbeat in time.
+    """
+    if job.heartbeat_at is None or job.heartbeat_at < stale_before:
+        return True
+    host, _, pid = (job.owner or "").rpartition(":")
+    if host == socket.gethostname() and pid.isdigit():
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass  # The process exists but belongs to another user
+    return False
+
+
+class ExportWorker:
+    """
+    Runs export jobs in a dedicated thread pool limited to `EXPORT_MAX_CONCURRENCY` jobs, so
+    that exports do not take the threads and database connections of the prediction requests.
+    """
+
+    def __init__(self, max_workers: int = EXPORT_MAX_CONCURRENCY):
+        self.max_workers = max_workers
+        self._executor = None
+
+    def start(self) -> None:
+        """
+        Starts the pool and resumes the jobs left pending by a previous run.
+        Running jobs whose process has stopped are marked as failed; those still owned by a
+        live process are left alone.
+        """
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="export")
+
+        stale_before = _utcnow() - timedelta(seconds=5 * EXPORT_HEARTBEAT_SECONDS)
+        with Session(engine) as session:
+            running = session.scalars(select(ExportJob).where(ExportJob.status == "running")).all()
+            for job in running:
+                if _owner_is_gone(job, stale_before):
+                    session.execute(
+                        update(ExportJob)
+                        .where(ExportJob.id == job.id, ExportJob.status == "running", ExportJob.owner == job.owner)
+                        .values(status="failed", error="Interrupted by a server restart", finished_at=_utcnow())
+                    )
+            session.commit()
+            job_ids = session.scalars(select(ExportJob.id).where(ExportJob.status == "pending")).all()
+
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    def submit(self, job_id: int) -> None:
+        """
+        Queues the export job `job_id`.
+        """
+        if self._executor is None:
+            raise RuntimeError("Export worker is not started")
+        self._executor.submit(run_export, job_id)
+
+    def stop(self) -> None:
+        """
+        Stops the pool. Queued jobs stay pending and are resumed on the next start.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Shared worker used by the export endpoints
+export_worker = ExportWorker()
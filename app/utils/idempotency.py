@@ -0,0 +1,69 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import IDEMPOTENCY_CACHE_SIZE
+
+
+class IdempotencyCache:
+    """
+    Bounded in-process cache of recently answered Idempotency-Key values.
+
+    Answered keys map to the `(user_id, prediction)` of the original request and are
+    evicted in least-recently-used order once `maxsize` is reached. Keys whose request
+    is still being scored are tracked as futures so that a concurrent retry waits for
+    the first result instead of scoring the loan a second time.
+
+    The cache is only touched from the event loop, so it needs no locking.
+    """
+
+    def __init__(self, maxsize: int = IDEMPOTENCY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._results: "OrderedDict[str, Tuple[int, bool]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def get(self, key: str) -> Optional[Tuple[int, bool]]:
+        """
+        Returns the `(user_id, prediction)` stored for `key`, or `None` if it is not cached.
+        """
+        entry = self._results.get(key)
+        if entry is not None:
+            self._results.move_to_end(key)  # Mark as recently used
+        return entry
+
+    def put(self, key: str, user_id: int, prediction: bool) -> None:
+        """
+        Stores the answer for `key`, evicting the oldest entries beyond `maxsize`.
+        """
+        self._results[key] = (user_id, prediction)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def in_flight(self, key: str) -> Optional[asyncio.Future]:
+        """
+        Returns the future of the request currently processing `key`, if any.
+        """
+        return self._in_flight.get(key)
+
+    def reserve(self, key: str) -> None:
+        """
+        Marks `key` as being processed by the current request.
+        """
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+
+    def release(self, key: str, user_id: Optional[int] = None, prediction: Optional[bool] = None) -> None:
+        """
+        Ends processing of `key` and wakes up the requests waiting on it.
+
+        When `prediction` is `None` (the original request failed) nothing is cached and
+        the waiters fall back to processing the request themselves.
+        """
+        if prediction is not None:
+            self.put(key, user_id, prediction)
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+
+# Shared cache used by the loan request endpoint
+idempotency_cache = IdempotencyCache()
@@ -0,0 +1,180 @@
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Smoothing added to empty bins so that PSI stays finite
+PSI_EPSILON = 1e-4
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch for non-negative numeric values.
+
+    Values are counted in logarithmic buckets whose width is a fixed fraction of the value
+    (`relative_accuracy`), so any quantile is estimated within that relative error. Adding a
+    value is a single logarithm and a dictionary update, and two sketches are merged by
+    adding their bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.02, buckets: Optional[Dict[int, int]] = None, zero_count: int = 0):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = dict(buckets or {})
+        self.zero_count = zero_count  # Values <= 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates the value below which a fraction `q` of the values fall.
+        """
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Middle of the bucket (gamma^(index-1), gamma^index]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def distribution(self) -> Dict[int, float]:
+        """
+        Returns the fraction of values per bucket, the zero bucket having index `-inf`.
+        """
+        total = self.count
+        if total == 0:
+            return {}
+        distribution = {index: count / total for index, count in self.buckets.items()}
+        if self.zero_count:
+            distribution[-math.inf] = self.zero_count / total
+        return distribution
+
+    def to_dict(self) -> dict:
+        return {
+            "type": "quantile",
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        buckets = {int(index): count for index, count in data.get("buckets", {}).items()}
+        return cls(data.get("relative_accuracy", 0.02), buckets, data.get("zero_count", 0))
+
+
+class FrequencySketch:
+    """
+    Exact frequency counts for a categorical feature with a small number of distinct values.
+    """
+
+    def __init__(self, counts: Optional[Dict[str, int]] = None):
+        self.counts: Counter = Counter(counts or {})
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, value: str) -> None:
+        self.counts[value] += 1
+
+    def merge(self, other: "FrequencySketch") -> None:
+        self.counts.update(other.counts)
+
+    def distribution(self) -> Dict[str, float]:
+        total = self.count
+        if total == 0:
+            return {}
+        return {value: count / total for value, count in self.counts.items()}
+
+    def to_dict(self) -> dict:
+        return {"type": "frequency", "counts": dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FrequencySketch":
+        return cls(data.get("counts", {}))
+
+
+def sketch_from_dict(data: dict):
+    """
+    Rebuilds a sketch serialized with `to_dict`.
+    """
+    if data.get("type") == "quantile":
+        return QuantileSketch.from_dict(data)
+    return FrequencySketch.from_dict(data)
+
+
+def _psi(expected: List[float], actual: List[float]) -> float:
+    psi = 0.0
+    for e, a in zip(expected, actual):
+        e = max(e, PSI_EPSILON)
+        a = max(a, PSI_EPSILON)
+        psi += (a - e) * math.log(a / e)
+    return psi
+
+
+def categorical_psi(baseline: FrequencySketch, current: FrequencySketch) -> Optional[float]:
+    """
+    Population Stability Index between two frequency sketches.
+    """
+    expected, actual = baseline.distribution(), current.distribution()
+    if not expected or not actual:
+        return None
+    values = set(expected) | set(actual)
+    return _psi([expected.get(v, 0.0) for v in values], [actual.get(v, 0.0) for v in values])
+
+
+def numeric_psi(baseline: QuantileSketch, current: QuantileSketch, bins: int = 10) -> Optional[float]:
+    """
+    Population Stability Index between two quantile sketches, using `bins` groups of
+    buckets holding roughly equal shares of the baseline.
+    """
+    expected, actual = baseline.distribution(), current.distribution()
+    if not expected or not actual:
+        return None
+
+    expected_bins, actual_bins = [0.0] * bins, [0.0] * bins
+    cumulative = 0  # Baseline values in the buckets before `index` (an integer, free of rounding errors)
+    for index in sorted(set(expected) | set(actual)):
+        # Group buckets by the baseline decile they start in
+        group = min(cumulative * bins // baseline.count, bins - 1)
+        expected_bins[group] += expected.get(index, 0.0)
+        actual_bins[group] += actual.get(index, 0.0)
+        cumulative += baseline.zero_count if index == -math.inf else baseline.buckets.get(index, 0)
+    return _psi(expected_bins, actual_bins)
+
+
+def numeric_ks(baseline: QuantileSketch, current: QuantileSketch) -> Optional[float]:
+    """
+    Kolmogorov-Smirnov statistic (largest gap between the two CDFs) between two quantile sketches.
+    """
+    expected, actual = baseline.distribution(), current.distribution()
+    if not expected or not actual:
+        return None
+
+    statistic, cdf_expected, cdf_actual = 0.0, 0.0, 0.0
+    for index in sorted(set(expected) | set(actual)):
+        cdf_expected += expected.get(index, 0.0)
+        cdf_actual += actual.get(index, 0.0)
+        statistic = max(statistic, abs(cdf_expected - cdf_actual))
+    return statistic
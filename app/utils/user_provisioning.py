@@ -0,0 +1,244 @@
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List
+from pydantic import ValidationError
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.db.session import engine
+from app.models.users import User
+from app.models.loans import LoanRequests  # noqa: F401  Resolves User.loan_requests when run outside the app
+from app.schemas.user import UserBulkItem
+from app.core.security import get_password_hash
+from app.core.config import BULK_HASH_WORKERS, BULK_INSERT_BATCH_SIZE
+
+# Maximum number of values per IN clause when looking up existing users
+LOOKUP_CHUNK_SIZE = 500
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()  # Bulk requests run in the threadpool, so the pool may be requested concurrently
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool used to hash passwords, created on first use.
+    Workers are spawned rather than forked, as the application runs background threads.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=BULK_HASH_WORKERS or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def _discard_hash_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drops `pool` if it is still the current one (e.g. after a worker process died), so the
+    next call to `_get_hash_pool` starts a new pool.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_hash_pool() -> None:
+    """
+    Stops the password hashing processes, if they were started.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hashes `passwords` in the process pool. If the pool is broken (a worker process died),
+    it is replaced and the hashing is retried once.
+    """
+    chunksize = max(1, len(passwords) // (4 * (BULK_HASH_WORKERS or os.cpu_count())))
+    for attempt in range(2):
+        pool = _get_hash_pool()
+        try:
+            return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+        except BrokenProcessPool:
+            _discard_hash_pool(pool)
+            if attempt:
+                raise
+
+
+def parse_user_rows(content: str, fmt: str) -> List[dict]:
+    """
+    Parses a list of users given as CSV (with a header line) or as a JSON list of objects.
+
+    Parameters:
+    - `content` (str): The CSV or JSON document.
+    - `fmt` (str): "csv" or "json".
+
+    Returns:
+    - `List[dict]`: One dictionary per user.
+
+    Raises:
+    - `ValueError`: If the document cannot be parsed.
+    """
+    if fmt == "csv":
+        # Empty cells are treated as missing values (e.g. an empty role defaults to "user")
+        return [
+            {key: value for key, value in row.items() if value not in (None, "")}
+            for row in csv.DictReader(io.StringIO(content))
+        ]
+
+    rows = json.loads(content)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Expected a JSON list of user objects")
+    return rows
+
+
+def _find_existing(session: Session, usernames: List[str], emails: List[str]):
+    """
+    Returns the usernames and emails among those given that are already taken, using
+    set-based queries (IN lists of at most `LOOKUP_CHUNK_SIZE` values).
+    """
+    taken_usernames, taken_emails = set(), set()
+    for i in range(0, max(len(usernames), len(emails)), LOOKUP_CHUNK_SIZE):
+        statement = select(User.username, User.email).where(or_(
+            User.username.in_(usernames[i:i + LOOKUP_CHUNK_SIZE]),
+            User.email.in_(emails[i:i + LOOKUP_CHUNK_SIZE])
+        ))
+        for username, email in session.exec(statement):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+    return taken_usernames, taken_emails
+
+
+def _insert_batch(session: Session, batch: List[tuple], results: Dict[int, dict]) -> None:
+    """
+    Inserts a batch of `(row, user)` in one transaction. If a concurrent insert makes the
+    batch violate a unique constraint, the users are inserted one by one instead.
+    """
+    session.add_all([user for _, user in batch])
+    try:
+        session.flush()  # Assigns the IDs without reloading each user after the commit
+        ids = [user.id for _, user in batch]
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        if len(batch) > 1:
+            for row, user in batch:
+                # Fresh objects, as the rolled back ones keep the IDs assigned by the flush
+                _insert_batch(session, [(row, User(**user.model_dump(exclude={"id"})))], results)
+            return
+        results[batch[0][0]].update(status="error", detail="Username or email already in use")
+        return
+
+    for (row, _), user_id in zip(batch, ids):
+        results[row].update(status="created", id=user_id)
+
+
+def provision_users(session: Session, rows: List[dict]) -> dict:
+    """
+    Creates many users at once (inactive, like `POST /admin/users`).
+
+    Existing usernames and emails are looked up with set-based queries, passwords are
+    hashed in parallel in a process pool, and the users are inserted in transactions of
+    `BULK_INSERT_BATCH_SIZE` users.
+
+    Parameters:
+    - `session` (Session): The database session.
+    - `rows` (List[dict]): The users to create (`username`, `email`, `password`, optional `role`).
+
+    Returns:
+    - `dict`: Number of created and failed users, and the result of each row.
+    """
+    results: Dict[int, dict] = {}
+    valid = []  # (row, UserBulkItem)
+    seen_usernames, seen_emails = set(), set()
+
+    # Validate the rows and reject duplicates within the list
+    for row, data in enumerate(rows, start=1):
+        username = data.get("username")
+        results[row] = {
+            "row": row,
+            "username": username if isinstance(username, str) else None,  # Not validated yet
+            "status": "error", "id": None, "detail": None
+        }
+        try:
+            item = UserBulkItem.model_validate(data)
+        except ValidationError as e:
+            errors = e.errors()
+            results[row]["detail"] = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in errors)
+            continue
+        if item.username in seen_usernames or item.email in seen_emails:
+            results[row]["detail"] = "Duplicate username or email in the list"
+            continue
+        seen_usernames.add(item.username)
+        seen_emails.add(item.email)
+        valid.append((row, item))
+
+    # Reject the users that already exist
+    taken_usernames, taken_emails = _find_existing(
+        session, [item.username for _, item in valid], [item.email for _, item in valid]
+    )
+    to_create = []
+    for row, item in valid:
+        if item.username in taken_usernames or item.email in taken_emails:
+            results[row]["detail"] = "Username or email already in use"
+        else:
+            to_create.append((row, item))
+
+    # Hash the passwords in parallel
+    hashes = _hash_passwords([item.password for _, item in to_create]) if to_create else []
+
+    # Insert the users in batches
+    users = [
+        (row, User(username=item.username, email=item.email, hashed_password=hashed_password,
+                   role=item.role, is_active=False))  # The user must be activated
+        for (row, item), hashed_password in zip(to_create, hashes)
+    ]
+    for i in range(0, len(users), BULK_INSERT_BATCH_SIZE):
+        _insert_batch(session, users[i:i + BULK_INSERT_BATCH_SIZE], results)
+
+    ordered = [results[row] for row in sorted(results)]
+    created = sum(1 for result in ordered if result["status"] == "created")
+    return {"created": created, "failed": len(ordered) - created, "results": ordered}
+
+
+def main() -> None:
+    """
+    Command line entry point: `python -m app.utils.user_provisioning users.csv`.
+    """
+    parser = argparse.ArgumentParser(description="Create many users from a CSV or JSON file.")
+    parser.add_argument("file", help="CSV file with a header line (username,email,password[,role]) or JSON list")
+    parser.add_argument("--format", choices=["csv", "json"], help="File format (default: from the file extension)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("json" if args.file.lower().endswith(".json") else "csv")
+    with open(args.file, encoding="utf-8") as file:
+        rows = parse_user_rows(file.read(), fmt)
+
+    try:
+        with Session(engine) as session:
+            summary = provision_users(session, rows)
+    finally:
+        shutdown_hash_pool()
+
+    for result in summary["results"]:
+        print(f"{result['row']}\t{result['username']}\t{result['status']}\t{result['id'] or result['detail']}")
+    print(f"Created: {summary['created']}, failed: {summary['failed']}")
+
+
+if __name__ == "__main__":
+    main()
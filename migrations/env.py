@@ -2,6 +2,9 @@ from logging.config import fileConfig
 from sqlmodel import SQLModel
 from app.models.users import User
 from app.models.loans import LoanRequests
+from app.models.tokens import RevokedToken
+from app.models.drift import FeatureSketch
+from app.models.exports import ExportJob
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from pathlib import Path
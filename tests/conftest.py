@@ -0,0 +1,26 @@
+import os
+
+# Settings read on import (app.db.session creates the engine, the JWT helpers read the algorithm)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+import pytest  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel, create_engine  # noqa: E402
+import app.models.drift, app.models.exports, app.models.loans, app.models.tokens  # noqa: E401, E402, F401
+from app.utils import archive, drift, exports, user_provisioning  # noqa: E402
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """
+    In-memory SQLite database with every table, used in place of the application engine.
+    A single connection is shared so that background threads see the same database.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    for module in (archive, drift, exports, user_provisioning):
+        monkeypatch.setattr(module, "engine", engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,177 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+import pytest
+from sqlmodel import Session, select
+from app.models.loans import LoanRequests
+from app.models.users import User
+from app.utils import archive
+from app.utils.archive import archive_old_loan_requests, archived_dates, backfill_created_at, read_archived_loan_requests
+
+NOW = datetime.now(timezone.utc).replace(tzinfo=None)
+OLD = datetime(NOW.year - 2, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def archive_dir(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_TABLE_DIR", str(tmp_path / "loan_requests"))
+    monkeypatch.setattr(archive, "ARCHIVE_BATCH_SIZE", 3)
+    with Session(engine) as session:
+        session.add(User(username="alice", email="alice@example.com", hashed_password="x"))
+        session.add(User(username="bob", email="bob@example.com", hashed_password="x"))
+        session.commit()
+    return tmp_path / "loan_requests"
+
+
+def _add_loans(engine, *created_at, user_id=1):
+    with Session(engine) as session:
+        for moment in created_at:
+            session.add(LoanRequests(
+                user_id=user_id, GrAppv=1000.0, Term=12, State="CA", NAICS_Sectors=44, New="Yes", Franchise="No",
+                NoEmp="3", RevLineCr="No", LowDoc="No", Rural="No", prediction="1", created_at=moment
+            ))
+        session.commit()
+
+
+def _table_ids(engine):
+    with Session(engine) as session:
+        return session.exec(select(LoanRequests.id).order_by(LoanRequests.id)).all()
+
+
+def _files(archive_dir):
+    return sorted(os.path.relpath(os.path.join(root, name), archive_dir)
+                  for root, _, names in os.walk(archive_dir) for name in names)
+
+
+def test_archive_moves_old_rows_to_daily_partitions(engine, archive_dir):
+    _add_loans(engine, OLD, OLD + timedelta(hours=1), OLD + timedelta(days=1), NOW - timedelta(days=1), NOW)
+    _add_loans(engine, OLD + timedelta(days=1), user_id=2)
+
+    assert archive_old_loan_requests(max_age_days=30) == 4
+
+    assert _table_ids(engine) == [4, 5]
+    day = OLD.date()
+    assert archived_dates() == [day, day + timedelta(days=1)]
+    assert _files(archive_dir) == [
+        f"date={day}/part-1-2.parquet",
+        f"date={day + timedelta(days=1)}/part-3-3.parquet",
+        f"date={day + timedelta(days=1)}/part-6-6.parquet",
+    ]
+    assert [row["id"] for row in read_archived_loan_requests()] == [1, 2, 3, 6]
+    assert archive_old_loan_requests(max_age_days=30) == 0
+
+
+def test_archive_keeps_rows_when_writing_fails(engine, archive_dir, monkeypatch):
+    _add_loans(engine, OLD, OLD, OLD + timedelta(days=1))
+
+    def fail(day, df):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(archive, "_write_partition", fail)
+    with pytest.raises(OSError):
+        archive_old_loan_requests(max_age_days=30)
+    assert _table_ids(engine) == [1, 2, 3]
+
+
+def test_read_archived_prunes_partitions(engine, archive_dir, monkeypatch):
+    _add_loans(engine, OLD, OLD + timedelta(days=1), OLD + timedelta(days=2))
+    _add_loans(engine, OLD + timedelta(days=1, hours=2), user_id=2)
+    archive_old_loan_requests(max_age_days=30)
+
+    opened = []
+    read_table = archive.pq.read_table
+
+    def recording_read_table(path, **kwargs):
+        opened.append(os.path.basename(os.path.dirname(path)))
+        return read_table(path, **kwargs)
+
+    monkeypatch.setattr(archive.pq, "read_table", recording_read_table)
+
+    start, end = OLD + timedelta(days=1), OLD + timedelta(days=2)
+    rows = read_archived_loan_requests(start=start, end=end)
+    assert [row["id"] for row in rows] == [2, 4]
+    assert set(opened) == {f"date={start.date()}", f"date={end.date()}"}
+
+    opened.clear()
+    rows = read_archived_loan_requests(start=OLD + timedelta(days=1), user_id=2)
+    assert [(row["id"], row["user_id"]) for row in rows] == [(4, 2)]
+    assert set(opened) == {f"date={start.date()}", f"date={end.date()}"}
+
+    opened.clear()
+    assert read_archived_loan_requests(start=NOW - timedelta(days=1)) == []
+    assert opened == []
+
+
+def test_backfill_created_at(engine, archive_dir):
+    _add_loans(engine, OLD)
+    with Session(engine) as session:
+        session.add(LoanRequests(
+            user_id=1, GrAppv=1000.0, Term=12, State="CA", NAICS_Sectors=44, New="Yes", Franchise="No",
+            NoEmp="3", RevLineCr="No", LowDoc="No", Rural="No", prediction="1"
+        ))
+        session.commit()
+        # Written before the column existed
+        session.connection().exec_driver_sql("UPDATE loanrequests SET created_at = NULL WHERE id = 2")
+        session.commit()
+
+    assert backfill_created_at() == 1
+    assert backfill_created_at() == 0
+    with Session(engine) as session:
+        loans = session.exec(select(LoanRequests).order_by(LoanRequests.id)).all()
+    assert loans[0].created_at == OLD
+    assert loans[1].created_at >= NOW
+
+
+def test_write_partition_uses_a_temp_file_per_writer(archive_dir, monkeypatch):
+    df = pd.DataFrame({"id": [1, 2], "created_at": [OLD, OLD]})
+    written = []
+    write_table = archive.pq.write_table
+
+    def recording_write_table(table, path, **kwargs):
+        written.append(path)
+        write_table(table, path, **kwargs)
+
+    monkeypatch.setattr(archive.pq, "write_table", recording_write_table)
+    archive._write_partition(OLD.date(), df)
+    archive._write_partition(OLD.date(), df)
+    assert len(set(written)) == 2
+    assert _files(archive_dir) == [f"date={OLD.date()}/part-1-2.parquet"]
+
+    def failing_write_table(table, path, **kwargs):
+        write_table(table, path, **kwargs)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(archive.pq, "write_table", failing_write_table)
+    with pytest.raises(OSError):
+        archive._write_partition(OLD.date(), df.assign(id=[3, 4]))
+    assert _files(archive_dir) == [f"date={OLD.date()}/part-1-2.parquet"]  # No temp file left behind
+
+
+def test_runs_of_one_process_do_not_overlap(engine, archive_dir, monkeypatch):
+    _add_loans(engine, *(OLD + timedelta(days=i) for i in range(7)))
+
+    active, overlaps = [], []
+    write_partition = archive._write_partition
+
+    def slow_write_partition(day, df):
+        active.append(day)
+        if len(active) > 1:
+            overlaps.append(day)
+        threading.Event().wait(0.02)
+        write_partition(day, df)
+        active.remove(day)
+
+    monkeypatch.setattr(archive, "_write_partition", slow_write_partition)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(archive_old_loan_requests(max_age_days=30)))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert sorted(results) == [0, 7]
+    assert _table_ids(engine) == []
+    assert [row["id"] for row in read_archived_loan_requests()] == list(range(1, 8))
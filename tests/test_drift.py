@@ -0,0 +1,64 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+from app.api.v1.endpoints.drift import get_drift_report, set_drift_baseline
+from app.utils.drift import BASELINE_WINDOW, load_sketches, new_sketches, save_sketches, window_start
+
+WINDOW = "2026-10-19T00:00:00"
+
+
+def _sketches(amounts, prediction=True):
+    sketches = new_sketches()
+    for amount in amounts:
+        sketches["GrAppv"].add(amount)
+        sketches["prediction"].add("approved" if prediction else "rejected")
+    return sketches
+
+
+def test_window_start_converts_to_utc():
+    assert window_start(datetime(2026, 10, 19, 13, 30)) == WINDOW
+    assert window_start(datetime.fromisoformat("2026-10-19T01:00:00+02:00")) == "2026-10-18T00:00:00"
+
+
+def test_load_sketches_merges_the_rows_of_every_worker(engine):
+    with Session(engine) as session:
+        save_sketches(session, WINDOW, _sketches([100, 200]), worker="host:1")
+        save_sketches(session, WINDOW, _sketches([300], prediction=False), worker="host:2")
+        save_sketches(session, WINDOW, _sketches([400]), worker="host:1")
+
+        sketches = load_sketches(session, WINDOW)
+        assert sketches["GrAppv"].count == 4
+        assert sketches["prediction"].counts == {"approved": 3, "rejected": 1}
+
+        save_sketches(session, BASELINE_WINDOW, sketches, replace=True)
+        save_sketches(session, BASELINE_WINDOW, sketches, replace=True)
+        assert load_sketches(session, BASELINE_WINDOW)["GrAppv"].count == 4
+
+
+@pytest.mark.parametrize("window", ["2026-10-19T00:00:00Z", "2026-10-19T00:00:00+00:00", "2026-10-19", "2026-10-19T15:45:00"])
+def test_drift_endpoints_accept_any_spelling_of_the_window(engine, window):
+    admin = SimpleNamespace(role="admin")
+    with Session(engine) as session:
+        save_sketches(session, WINDOW, _sketches([100, 200, 300]))
+
+        assert set_drift_baseline(window=window, current_user=admin, session=session)["success"]
+        report = get_drift_report(window=window, current_user=admin, session=session)
+
+    assert report["window"] == WINDOW
+    assert report["window_requests"] == 3
+    assert report["features"]["GrAppv"]["psi"] == pytest.approx(0.0)
+
+
+def test_drift_endpoints_reject_invalid_windows(engine):
+    admin = SimpleNamespace(role="admin")
+    with Session(engine) as session:
+        for endpoint in (get_drift_report, set_drift_baseline):
+            with pytest.raises(HTTPException) as error:
+                endpoint(window="yesterday", current_user=admin, session=session)
+            assert error.value.status_code == 400
+
+        with pytest.raises(HTTPException) as error:
+            set_drift_baseline(window="2026-10-20", current_user=admin, session=session)
+        assert error.value.status_code == 404
@@ -0,0 +1,177 @@
+import gzip
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlmodel import Session
+from app.models.exports import ExportJob
+from app.models.loans import LoanRequests
+from app.models.users import User
+from app.utils import archive, exports
+from app.utils.exports import WORKER_ID, ExportWorker, _finish_job, _owner_is_gone, run_export
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def dirs(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_DIR", str(tmp_path / "exports"))
+    monkeypatch.setattr(exports, "EXPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(archive, "ARCHIVE_TABLE_DIR", str(tmp_path / "archive"))
+    with Session(engine) as session:
+        session.add(User(username="alice", email="alice@example.com", hashed_password="x"))
+        session.add(User(username="bob", email="bob@example.com", hashed_password="x"))
+        session.commit()
+
+
+def _loan(**values) -> LoanRequests:
+    fields = dict(user_id=1, GrAppv=1000.0, Term=12, State="CA", NAICS_Sectors=44, New="Yes", Franchise="No",
+                  NoEmp="3", RevLineCr="No", LowDoc="No", Rural="No", prediction="1")
+    fields.update(values)
+    return LoanRequests(**fields)
+
+
+def _job(**values) -> ExportJob:
+    return ExportJob(requested_by=1, created_at=_utcnow(), **values)
+
+
+def _export(engine, **values) -> ExportJob:
+    with Session(engine) as session:
+        job = _job(**values)
+        session.add(job)
+        session.commit()
+        run_export(job.id)
+        session.refresh(job)
+        return job
+
+
+def test_parquet_export_with_null_first_chunk(engine, dirs):
+    with Session(engine) as session:
+        for i in range(5):
+            session.add(_loan(GrAppv=1000.0 + i, idempotency_key=f"key-{i}" if i >= 3 else None))
+        session.commit()
+
+    job = _export(engine, format="parquet")
+
+    assert job.status == "completed", job.error
+    assert job.row_count == 5
+    table = pq.read_table(job.file_path)
+    assert table.schema.field("idempotency_key").type == pa.string()
+    assert table.schema.field("created_at").type == pa.timestamp("us")
+    assert table.column("idempotency_key").to_pylist() == [None, None, None, "key-3", "key-4"]
+    assert table.column("GrAppv").to_pylist() == [1000.0, 1001.0, 1002.0, 1003.0, 1004.0]
+
+
+def test_csv_export_with_filters_and_user(engine, dirs):
+    with Session(engine) as session:
+        session.add(_loan(user_id=1, State="CA", prediction="1"))       # 1: kept
+        session.add(_loan(user_id=2, State="CA", prediction="True"))    # 2: kept
+        session.add(_loan(user_id=1, State="CA", prediction="0"))       # 3: rejected
+        session.add(_loan(user_id=1, State="NY", prediction="1"))       # 4: other state
+        session.add(_loan(user_id=2, State="CA", prediction="true"))    # 5: kept
+        session.commit()
+
+    job = _export(engine, format="csv.gz", filters='{"prediction": true, "state": "CA"}', include_user=True)
+
+    assert job.status == "completed", job.error
+    assert job.row_count == 3
+    with gzip.open(job.file_path, "rt") as file:
+        df = pd.read_csv(file)
+    assert df["id"].tolist() == [1, 2, 5]
+    assert df["username"].tolist() == ["alice", "bob", "bob"]
+    assert df["email"].tolist() == ["alice@example.com", "bob@example.com", "bob@example.com"]
+
+    job = _export(engine, format="csv.gz", filters='{"prediction": false}')
+    with gzip.open(job.file_path, "rt") as file:
+        df = pd.read_csv(file)
+    assert df["id"].tolist() == [3]
+    assert "username" not in df.columns
+
+
+def test_export_includes_archived_rows_once(engine, dirs):
+    old = _utcnow() - timedelta(days=400)
+    with Session(engine) as session:
+        for i in range(4):
+            session.add(_loan(user_id=1 + i % 2, created_at=old + timedelta(days=i)))
+        session.add(_loan(user_id=1))
+        session.commit()
+    assert archive.archive_old_loan_requests(max_age_days=30) == 4
+
+    # Archival interrupted between writing and deleting: loan request 1 is in both places
+    with Session(engine) as session:
+        session.add(_loan(id=1, user_id=1, created_at=old))
+        session.commit()
+
+    job = _export(engine, format="parquet", include_user=True)
+    assert job.status == "completed", job.error
+    table = pq.read_table(job.file_path)
+    assert sorted(table.column("id").to_pylist()) == [1, 2, 3, 4, 5]
+    users = dict(zip(table.column("id").to_pylist(), table.column("username").to_pylist()))
+    assert users == {1: "alice", 2: "bob", 3: "alice", 4: "bob", 5: "alice"}
+
+    job = _export(engine, format="parquet", filters='{"user_id": 2}')
+    assert pq.read_table(job.file_path).column("id").to_pylist() == [2, 4]
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_owner_is_gone():
+    now = _utcnow()
+    stale_before = now - timedelta(minutes=5)
+    host = socket.gethostname()
+
+    assert _owner_is_gone(ExportJob(owner="other-host:1", heartbeat_at=now - timedelta(minutes=10)), stale_before)
+    assert _owner_is_gone(ExportJob(owner="other-host:1", heartbeat_at=None), stale_before)
+    assert not _owner_is_gone(ExportJob(owner="other-host:1", heartbeat_at=now), stale_before)
+    assert not _owner_is_gone(ExportJob(owner=f"{host}:{os.getpid()}", heartbeat_at=now), stale_before)
+    assert _owner_is_gone(ExportJob(owner=f"{host}:{_dead_pid()}", heartbeat_at=now), stale_before)
+
+
+def test_finish_job_only_updates_own_running_jobs(engine):
+    with Session(engine) as session:
+        session.add(User(username="alice", email="alice@example.com", hashed_password="x"))
+        own = _job(status="running", owner=WORKER_ID)
+        other = _job(status="running", owner="other-host:1")
+        reaped = _job(status="failed", owner=WORKER_ID)
+        session.add_all([own, other, reaped])
+        session.commit()
+
+        assert _finish_job(session, own.id, status="completed", row_count=3)
+        assert not _finish_job(session, other.id, status="completed", row_count=3)
+        assert not _finish_job(session, reaped.id, status="completed", row_count=3)
+
+        session.expire_all()
+        assert (own.status, own.row_count) == ("completed", 3)
+        assert (other.status, other.row_count, other.finished_at) == ("running", 0, None)
+        assert reaped.status == "failed"
+
+
+def test_worker_start_only_reaps_jobs_of_stopped_processes(engine, dirs):
+    now = _utcnow()
+    with Session(engine) as session:
+        jobs = [
+            _job(status="running", owner="other-host:1", heartbeat_at=now),
+            _job(status="running", owner="other-host:1", heartbeat_at=now - timedelta(hours=1)),
+            _job(status="running", owner=f"{socket.gethostname()}:{_dead_pid()}", heartbeat_at=now),
+            _job(status="pending", format="csv.gz"),
+        ]
+        session.add_all(jobs)
+        session.commit()
+
+        worker = ExportWorker()
+        worker.start()
+        worker.stop()
+
+        session.expire_all()
+        assert [job.status for job in jobs] == ["running", "failed", "failed", "completed"]
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import event
+from sqlmodel import Session, select
+from app.api.v1.endpoints import auth
+from app.core import security
+from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.jwt_handler import create_access_token
+from app.core.token_denylist import TokenDenylist
+from app.models.tokens import RevokedToken
+from app.models.users import User
+
+
+@pytest.fixture
+def denylist(monkeypatch):
+    denylist = TokenDenylist(sync_interval=60)
+    monkeypatch.setattr(security, "token_denylist", denylist)
+    monkeypatch.setattr(auth, "token_denylist", denylist)
+    return denylist
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        session.add(User(username="alice", email="alice@example.com", hashed_password="x"))
+        session.commit()
+        yield session
+
+
+def _claims(token: str) -> dict:
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def test_get_current_user_rejects_revoked_token(denylist, session):
+    token = create_access_token({"sub": "alice"})
+    other_token = create_access_token({"sub": "alice"})
+    assert security.get_current_user(token, session).username == "alice"
+
+    claims = _claims(token)
+    denylist.add(claims["jti"], claims["exp"])
+
+    with pytest.raises(HTTPException) as error:
+        security.get_current_user(token, session)
+    assert error.value.status_code == 401
+    assert error.value.detail == "Token has been revoked"
+    # Other tokens of the same user are still accepted
+    assert security.get_current_user(other_token, session).username == "alice"
+
+
+def test_entries_drop_out_at_expiry(denylist, session):
+    denylist.add("expired", time.time() - 1)
+    denylist.add("valid", time.time() + 60)
+
+    assert not denylist.is_revoked("expired", session)
+    assert "expired" not in denylist._expiry
+    assert denylist.is_revoked("valid", session)
+    assert not denylist.is_revoked("unknown", session)
+
+
+def test_sync_keeps_local_additions_not_visible_yet(session):
+    denylist = TokenDenylist(sync_interval=0)  # Reload on every check
+    denylist.add("local", time.time() + 60)
+    denylist.add("local-expired", time.time() - 1)
+
+    # No RevokedToken row exists (e.g. the logout transaction is not visible to this session)
+    assert denylist.is_revoked("local", session)
+    assert "local-expired" not in denylist._expiry
+
+
+def test_revocations_of_other_processes_are_picked_up_after_sync_interval(session):
+    denylist = TokenDenylist(sync_interval=0.2)
+    assert not denylist.is_revoked("remote", session)  # First check loads the denylist
+
+    # Revocation written by another worker
+    expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=5)
+    session.add(RevokedToken(jti="remote", expires_at=expires_at))
+    session.add(RevokedToken(jti="remote-expired", expires_at=expires_at - timedelta(minutes=10)))
+    session.commit()
+    assert not denylist.is_revoked("remote", session)  # Not reloaded yet
+
+    time.sleep(0.25)
+    assert denylist.is_revoked("remote", session)
+    assert not denylist.is_revoked("remote-expired", session)
+
+
+def test_logout_twice(denylist, session):
+    token = create_access_token({"sub": "alice"})
+
+    assert asyncio.run(auth.logout(token=token, session=session)) == {"message": "Logout successful"}
+    assert asyncio.run(auth.logout(token=token, session=session)) == {"message": "Logout successful"}
+
+    assert len(session.exec(select(RevokedToken)).all()) == 1
+    assert denylist.is_revoked(_claims(token)["jti"], session)
+
+
+def test_concurrent_logout_takes_integrity_error_path(denylist, session, engine):
+    token = create_access_token({"sub": "alice"})
+    jti = _claims(token)["jti"]
+    assert not denylist.is_revoked(jti, session)  # Loads the denylist before the concurrent logout
+
+    # Another worker revokes the same token after this one checked the denylist
+    with Session(engine) as other_session:
+        expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=5)
+        other_session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        other_session.commit()
+
+    rollbacks = []
+    event.listen(session, "after_rollback", lambda s: rollbacks.append(s))
+    assert asyncio.run(auth.logout(token=token, session=session)) == {"message": "Logout successful"}
+
+    assert rollbacks  # The duplicate jti was rejected by the unique constraint
+    assert len(session.exec(select(RevokedToken)).all()) == 1
+    assert denylist.is_revoked(jti, session)
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+from app.core.security import verify_password
+from app.models.users import User
+from app.schemas.user import UserBulkResponse
+from app.utils import user_provisioning
+from app.utils.user_provisioning import provision_users
+
+
+@pytest.fixture(autouse=True)
+def hash_pool(monkeypatch):
+    monkeypatch.setattr(user_provisioning, "BULK_HASH_WORKERS", 1)
+    yield
+    user_provisioning.shutdown_hash_pool()
+
+
+def test_provision_users(engine):
+    with Session(engine) as session:
+        session.add(User(username="taken", email="taken@example.com", hashed_password="x"))
+        session.commit()
+
+    rows = [
+        {"username": "alice", "email": "alice@example.com", "password": "secret123"},
+        {"username": "bob", "email": "bob@example.com", "password": "secret456", "role": "admin"},
+        {"username": "alice", "email": "alice2@example.com", "password": "secret123"},
+        {"username": "taken", "email": "other@example.com", "password": "secret123"},
+        {"username": "carol", "email": "not an email", "password": "secret123"},
+    ]
+    with Session(engine) as session:
+        summary = provision_users(session, rows)
+
+    assert summary["created"] == 2
+    assert summary["failed"] == 3
+    assert [result["status"] for result in summary["results"]] == ["created", "created", "error", "error", "error"]
+    assert summary["results"][2]["detail"] == "Duplicate username or email in the list"
+    assert summary["results"][3]["detail"] == "Username or email already in use"
+
+    with Session(engine) as session:
+        users = {user.username: user for user in session.exec(select(User))}
+    assert set(users) == {"taken", "alice", "bob"}
+    assert users["bob"].role == "admin"
+    assert not users["alice"].is_active
+    assert verify_password("secret123", users["alice"].hashed_password)
+    assert summary["results"][0]["id"] == users["alice"].id
+
+
+def test_provision_users_reports_rows_with_a_non_string_username(engine):
+    rows = [
+        {"username": "alice", "email": "alice@example.com", "password": "secret123"},
+        {"username": 5, "email": "five@example.com", "password": "secret123"},
+    ]
+    with Session(engine) as session:
+        summary = provision_users(session, rows)
+
+    # The response model of POST /admin/users/bulk accepts the results
+    response = UserBulkResponse.model_validate(summary)
+    assert response.created == 1
+    assert response.results[1].status == "error"
+    assert response.results[1].username is None
+    assert response.results[1].detail.startswith("username:")
+
+
+def test_main(engine, tmp_path, monkeypatch, capsys):
+    path = tmp_path / "users.csv"
+    path.write_text("username,email,password,role\nalice,alice@example.com,secret123,\nbob,not an email,secret456,\n")
+    monkeypatch.setattr(sys, "argv", ["user_provisioning", str(path)])
+
+    user_provisioning.main()
+
+    output = capsys.readouterr().out
+    assert "Created: 1, failed: 1" in output
+    with Session(engine) as session:
+        assert session.exec(select(User.username)).all() == ["alice"]
+
+
+def test_cli_in_a_fresh_interpreter(tmp_path):
+    # Only the modules imported by the CLI itself are loaded, unlike in this test session
+    database_url = f"sqlite:///{tmp_path / 'users.db'}"
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+    path = tmp_path / "users.csv"
+    path.write_text("username,email,password\nalice,alice@example.com,secret123\n")
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "app.utils.user_provisioning", str(path)],
+        env={**os.environ, "DATABASE_URL": database_url, "BULK_HASH_WORKERS": "1"},
+        capture_output=True, text=True, timeout=120
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert "Created: 1, failed: 0" in completed.stdout
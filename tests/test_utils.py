@@ -0,0 +1,226 @@
+import asyncio
+import json
+import math
+import random
+import pytest
+from app.utils.idempotency import IdempotencyCache
+from app.utils.user_provisioning import parse_user_rows
+from app.utils.sketches import (
+    PSI_EPSILON, QuantileSketch, FrequencySketch, sketch_from_dict, categorical_psi, numeric_psi, numeric_ks
+)
+
+
+def _quantile_sketch(values) -> QuantileSketch:
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def _frequency_sketch(values) -> FrequencySketch:
+    sketch = FrequencySketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def _lognormal(mu: float, seed: int, n: int = 20000):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(mu, 1.0) for _ in range(n)]
+
+
+# --- Drift sketches ---
+
+def test_psi_and_ks_of_same_distribution_are_close_to_zero():
+    baseline = _quantile_sketch(_lognormal(10, seed=1))
+    current = _quantile_sketch(_lognormal(10, seed=2))
+    assert numeric_psi(baseline, current) < 0.01
+    assert numeric_ks(baseline, current) < 0.03
+
+
+def test_psi_and_ks_detect_a_shifted_distribution():
+    baseline = _quantile_sketch(_lognormal(10, seed=1))
+    current = _quantile_sketch(_lognormal(10.5, seed=2))
+    assert numeric_psi(baseline, current) > 0.2
+    # Largest CDF gap between N(0, 1) and N(0.5, 1): 2 * Phi(0.25) - 1
+    assert numeric_ks(baseline, current) == pytest.approx(math.erf(0.25 / math.sqrt(2)), abs=0.03)
+
+
+def test_ks_of_disjoint_ranges():
+    baseline = _quantile_sketch(range(1, 101))
+    current = _quantile_sketch(range(1001, 1101))
+    assert numeric_ks(baseline, current) == pytest.approx(1.0)
+
+
+def test_drift_of_empty_sketch_is_none():
+    empty, sketch = QuantileSketch(), _quantile_sketch([1, 2, 3])
+    assert numeric_psi(empty, sketch) is None
+    assert numeric_ks(sketch, empty) is None
+    assert categorical_psi(FrequencySketch(), _frequency_sketch("ab")) is None
+
+
+def test_quantile_sketch_zero_bucket():
+    sketch = _quantile_sketch([0, -5, 0, 10])
+    assert sketch.zero_count == 3
+    assert sketch.count == 4
+    assert sketch.distribution()[-math.inf] == pytest.approx(0.75)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(10, rel=sketch.relative_accuracy)
+
+
+def test_quantile_sketch_relative_accuracy():
+    values = _lognormal(5, seed=3)
+    sketch = _quantile_sketch(values)
+    values.sort()
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=sketch.relative_accuracy)
+
+
+def test_numeric_psi_groups_buckets_by_baseline_decile():
+    # Ten values in distinct buckets (the zero bucket first), each one tenth of the baseline
+    values = [0] + [2 ** i for i in range(1, 10)]
+    baseline = _quantile_sketch(values)
+    assert numeric_psi(baseline, _quantile_sketch(values)) == pytest.approx(0.0)
+
+    # Everything in the last decile: nine empty bins and one holding all the values
+    current = _quantile_sketch([values[-1]] * 10)
+    expected = 9 * (PSI_EPSILON - 0.1) * math.log(PSI_EPSILON / 0.1) + 0.9 * math.log(10)
+    assert numeric_psi(baseline, current) == pytest.approx(expected)
+
+    # Everything in the zero bucket
+    current = _quantile_sketch([0] * 10)
+    assert numeric_psi(baseline, current) == pytest.approx(expected)
+
+
+def test_quantile_sketch_merge_and_round_trip():
+    first = _quantile_sketch([0, 1.5, 20, 300])
+    second = _quantile_sketch([-1, 20, 4000])
+    first.merge(second)
+    assert first.count == 7
+    assert first.zero_count == 2
+
+    restored = sketch_from_dict(json.loads(json.dumps(first.to_dict())))
+    assert isinstance(restored, QuantileSketch)
+    assert restored.relative_accuracy == first.relative_accuracy
+    assert restored.zero_count == first.zero_count
+    assert restored.buckets == first.buckets
+    assert restored.distribution() == first.distribution()
+
+    merged_then_restored = _quantile_sketch([0, 1.5, 20, 300, -1, 20, 4000])
+    assert merged_then_restored.buckets == restored.buckets
+
+
+def test_frequency_sketch_merge_and_round_trip():
+    sketch = _frequency_sketch(["CA", "NY", "CA"])
+    sketch.merge(_frequency_sketch(["NY", "TX"]))
+    assert sketch.counts == {"CA": 2, "NY": 2, "TX": 1}
+
+    restored = sketch_from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert isinstance(restored, FrequencySketch)
+    assert restored.counts == sketch.counts
+
+
+def test_categorical_psi():
+    baseline = _frequency_sketch("aaabbc")
+    assert categorical_psi(baseline, _frequency_sketch("aaabbc")) == pytest.approx(0.0)
+
+    # a: 1/2 -> 1/6, b: 1/3 -> 1/6, c: 1/6 -> 2/3
+    expected = ((1 / 6 - 1 / 2) * math.log(1 / 3) + (1 / 6 - 1 / 3) * math.log(1 / 2)
+                + (2 / 3 - 1 / 6) * math.log(4))
+    assert categorical_psi(baseline, _frequency_sketch("abcccc")) == pytest.approx(expected)
+
+    # A value never seen in the baseline is smoothed rather than infinite
+    assert math.isfinite(categorical_psi(baseline, _frequency_sketch("aaad")))
+
+
+# --- Idempotency cache ---
+
+def test_idempotency_cache_evicts_least_recently_used():
+    cache = IdempotencyCache(maxsize=2)
+    cache.put("a", 1, True)
+    cache.put("b", 1, False)
+    assert cache.get("a") == (1, True)  # "b" is now the least recently used
+
+    cache.put("c", 2, True)
+    assert cache.get("b") is None
+    assert cache.get("a") == (1, True)
+    assert cache.get("c") == (2, True)
+
+
+def test_idempotency_cache_put_refreshes_existing_key():
+    cache = IdempotencyCache(maxsize=2)
+    cache.put("a", 1, True)
+    cache.put("b", 1, True)
+    cache.put("a", 1, False)
+    cache.put("c", 1, True)
+    assert cache.get("a") == (1, False)
+    assert cache.get("b") is None
+
+
+def test_idempotency_cache_release_wakes_waiters_and_caches_result():
+    async def retry(cache):
+        # What a concurrent request with the same key does
+        await asyncio.shield(cache.in_flight("key"))
+        return cache.get("key")
+
+    async def scenario():
+        cache = IdempotencyCache()
+        cache.reserve("key")
+        waiter = asyncio.ensure_future(retry(cache))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        cache.release("key", user_id=7, prediction=True)
+        assert await asyncio.wait_for(waiter, timeout=1) == (7, True)
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert cache.in_flight("key") is None
+
+
+def test_idempotency_cache_release_after_failure_caches_nothing():
+    async def scenario():
+        cache = IdempotencyCache()
+        cache.reserve("key")
+        future = cache.in_flight("key")
+        cache.release("key")
+        assert future.done()
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert cache.in_flight("key") is None
+    assert cache.get("key") is None
+
+
+# --- Bulk user provisioning ---
+
+def test_parse_user_rows_csv_drops_empty_cells():
+    content = "username,email,password,role\nalice,alice@example.com,secret1,admin\nbob,bob@example.com,secret2,\n"
+    assert parse_user_rows(content, "csv") == [
+        {"username": "alice", "email": "alice@example.com", "password": "secret1", "role": "admin"},
+        {"username": "bob", "email": "bob@example.com", "password": "secret2"},
+    ]
+
+
+def test_parse_user_rows_csv_short_line():
+    content = "username,email,password,role\ncarol,carol@example.com\n"
+    assert parse_user_rows(content, "csv") == [{"username": "carol", "email": "carol@example.com"}]
+
+
+def test_parse_user_rows_json():
+    rows = [{"username": "alice", "email": "alice@example.com", "password": "secret1"}]
+    assert parse_user_rows(json.dumps(rows), "json") == rows
+    assert parse_user_rows("[]", "json") == []
+
+
+@pytest.mark.parametrize("content", ['{"username": "alice"}', '["alice"]', '[{"username": "alice"}, 1]'])
+def test_parse_user_rows_json_rejects_non_list_of_objects(content):
+    with pytest.raises(ValueError):
+        parse_user_rows(content, "json")
+
+
+def test_parse_user_rows_invalid_json():
+    # json.JSONDecodeError is a ValueError, which the endpoint turns into a 400
+    with pytest.raises(ValueError):
+        parse_user_rows("not json", "json")